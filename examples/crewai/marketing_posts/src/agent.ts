@@ -1,6 +1,23 @@
 import OpenAI from 'openai';
+import { Agent as HttpsAgent } from 'https';
 import { AgentConfig, Tool, AgentResult } from './types.js';
 
+// One client for every agent in the process; constructing one per agent
+// re-reads the environment and sets up a separate HTTP connection pool.
+let sharedClient: OpenAI | undefined;
+
+// Keep-alive sockets let sequential and concurrent task calls reuse TLS connections.
+const keepAliveAgent = new HttpsAgent({ keepAlive: true, maxSockets: 64, maxFreeSockets: 32 });
+
+function getOpenAIClient(): OpenAI {
+  sharedClient ??= new OpenAI({
+    apiKey: process.env.OPENAI_API_KEY,
+    httpAgent: keepAliveAgent,
+    timeout: 60_000,
+  });
+  return sharedClient;
+}
+
 export class Agent {
   private config: AgentConfig;
   private tools: Tool[];
@@ -9,9 +26,7 @@ export class Agent {
   constructor(config: AgentConfig, tools: Tool[] = []) {
     this.config = config;
     this.tools = [...tools, ...(config.tools || [])];
-    this.openai = new OpenAI({
-      apiKey: process.env.OPENAI_API_KEY,
-    });
+    this.openai = getOpenAIClient();
   }
 
   get role(): string {
@@ -37,6 +37,9 @@ class MockWebScrapeTool implements Tool {
   }
 }
 
+// Tools are stateless, so every agent and crew instance shares one of each
+const sharedTools: Tool[] = [new MockSerperTool(), new MockWebScrapeTool()];
+
 export class MarketingPostsCrew {
   private agentsConfig: Record<string, any>;
   private tasksConfig: Record<string, any>;
@@ -55,7 +58,7 @@ export class MarketingPostsCrew {
   }
 
   private initializeAgents(): void {
-    const tools = [new MockSerperTool(), new MockWebScrapeTool()];
+    const tools = sharedTools;
 
     // Lead Market Analyst
     this.agents.lead_market_analyst = new Agent(
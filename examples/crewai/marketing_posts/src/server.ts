@@ -13,6 +13,7 @@ import {
 } from '@modelcontextprotocol/sdk/types.js';
 import { config } from 'dotenv';
 import { MarketingPostsCrew } from './marketing-posts-crew.js';
+import { silenceConsoleForStdio } from 'automcp-ts';
 import { resolve, dirname } from 'path';
 import { fileURLToPath } from 'url';
 
@@ -287,6 +288,8 @@ The marketing crew has been trained with ${iterations} iterations to improve per
     let serverTransport;
     
     if (transport === 'stdio') {
+      // stdout carries the protocol, so console output stays off for the server's lifetime
+      silenceConsoleForStdio();
       serverTransport = new StdioServerTransport();
     } else if (transport === 'sse') {
       serverTransport = new SSEServerTransport('/message', options);
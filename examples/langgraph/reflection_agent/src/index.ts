@@ -2,81 +2,116 @@
 
 import { StateGraph, END, START } from '@langchain/langgraph';
 import { ChatOpenAI } from '@langchain/openai';
-import { ChatPromptTemplate, MessagesPlaceholder } from '@langchain/core/prompts';
-import { AIMessage, HumanMessage, BaseMessage } from '@langchain/core/messages';
+import { AIMessage, HumanMessage, BaseMessage, SystemMessage } from '@langchain/core/messages';
 import { config } from 'dotenv';
+import { Agent as HttpsAgent } from 'https';
 import { z } from 'zod';
 
-// Load environment variables
-config();
-
 // Define the state schema
 const ReflectionStateSchema = z.object({
   query: z.string(),
   messages: z.array(z.any()).default([]),
+  // Essays generated so far; termination is decided on this, not on message count
+  iteration: z.number().default(0),
 });
 
 type ReflectionState = z.infer<typeof ReflectionStateSchema>;
 
+export interface ReflectionResult {
+  essay: string;
+  critiques: string[];
+  iterations: number;
+  // Raw graph messages, only included on request since serializing them is costly
+  messages?: BaseMessage[];
+}
+
+// The system prompts have no template variables, so they are built once as ready
+// messages and prepended to each call, skipping prompt-template formatting per step
+const generateSystemMessage = new SystemMessage(
+  "You are an essay assistant tasked with writing excellent 5-paragraph essays. " +
+  "Generate the best essay possible for the user's request. " +
+  "If the user provides critique, respond with a revised version of your previous attempts."
+);
+
+const reflectionSystemMessage = new SystemMessage(
+  "You are a teacher grading an essay submission. Generate critique and recommendations for the user's submission. " +
+  "Provide detailed recommendations, including requests for length, depth, style, etc."
+);
+
+// One client per model for the whole process: agents share its keep-alive
+// connection pool instead of each opening their own.
+const keepAliveAgent = new HttpsAgent({ keepAlive: true, maxSockets: 100, maxFreeSockets: 20 });
+const sharedModels = new Map<string, ChatOpenAI>();
+
+function getSharedModel(openaiModel: string): ChatOpenAI {
+  let llm = sharedModels.get(openaiModel);
+  if (!llm) {
+    llm = new ChatOpenAI({
+      modelName: openaiModel,
+      temperature: 0.1,
+      maxRetries: 2,
+      timeout: 60_000,
+      // Exact-match response cache: replayed prompts (same model, params and full
+      // message list) are answered in-process instead of re-sent to OpenAI
+      cache: true,
+      configuration: { httpAgent: keepAliveAgent },
+    });
+    sharedModels.set(openaiModel, llm);
+  }
+  return llm;
+}
+
+export type ReflectionStreamEvent =
+  // A fragment of the essay, emitted while a single-shot run is generating
+  | { type: "essay_delta"; content: string }
+  // A complete essay or critique, emitted as each graph step finishes
+  | { type: "essay" | "critique"; iteration: number; content: string };
+
+function messageText(message: BaseMessage): string {
+  return typeof message.content === "string" ? message.content : "";
+}
+
+// The essay under review is always the newest AI message, so scan from the end
+// rather than filtering the whole conversation on every step
+function lastAIMessage(messages: BaseMessage[]): AIMessage | undefined {
+  for (let i = messages.length - 1; i >= 0; i--) {
+    const msg = messages[i];
+    if (msg instanceof AIMessage) {
+      return msg;
+    }
+  }
+  return undefined;
+}
+
 export class ReflectionAgent {
   private llm: ChatOpenAI;
   private maxIterations: number;
   private graph: any;
-  private generatePrompt: ChatPromptTemplate;
-  private reflectionPrompt: ChatPromptTemplate;
 
-  constructor(openaiModel: string = "gpt-4o-mini", maxIterations: number = 3) {
-    this.llm = new ChatOpenAI({
-      modelName: openaiModel,
-      temperature: 0.1,
-    });
+  constructor(openaiModel: string = "gpt-4o-mini", maxIterations: number = 3, llm?: ChatOpenAI) {
+    this.llm = llm ?? getSharedModel(openaiModel);
     this.maxIterations = maxIterations;
 
-    // Set up generation prompt and chain
-    this.generatePrompt = ChatPromptTemplate.fromMessages([
-      [
-        "system",
-        "You are an essay assistant tasked with writing excellent 5-paragraph essays. " +
-        "Generate the best essay possible for the user's request. " +
-        "If the user provides critique, respond with a revised version of your previous attempts."
-      ],
-      new MessagesPlaceholder("messages"),
-    ]);
-
-    // Set up reflection prompt and chain
-    this.reflectionPrompt = ChatPromptTemplate.fromMessages([
-      [
-        "system",
-        "You are a teacher grading an essay submission. Generate critique and recommendations for the user's submission. " +
-        "Provide detailed recommendations, including requests for length, depth, style, etc."
-      ],
-      new MessagesPlaceholder("messages"),
-    ]);
-
     this.initializeGraph();
   }
 
   private async generationNode(state: ReflectionState): Promise<Partial<ReflectionState>> {
     console.log("✍️ Generating essay content...");
     
-    const messages = state.messages || [];
-    
-    // If messages is empty, create a new message from query
-    let inputMessages: BaseMessage[];
-    if (messages.length === 0) {
-      inputMessages = [new HumanMessage(state.query)];
-    } else {
-      inputMessages = messages;
-    }
+    // The query is stored as the first message, so every generation call sends
+    // the same prefix (system prompt, query, earlier turns) plus only the newest
+    // critique, which keeps the prompt eligible for OpenAI's prefix caching.
+    const inputMessages: BaseMessage[] = state.messages?.length
+      ? state.messages
+      : [new HumanMessage(state.query)];
 
-    // Generate response using the prompt template
-    const chain = this.generatePrompt.pipe(this.llm);
-    const response = await chain.invoke({ messages: inputMessages });
+    // Generate response from the system prompt plus the conversation so far
+    const response = await this.llm.invoke([generateSystemMessage, ...inputMessages]);
 
     // Add the new AI message to the existing messages
-    const updatedMessages = [...messages, response];
-    
-    return { messages: updatedMessages };
+    const updatedMessages = [...inputMessages, response];
+
+    return { messages: updatedMessages, iteration: (state.iteration ?? 0) + 1 };
   }
 
   private async reflectionNode(state: ReflectionState): Promise<Partial<ReflectionState>> {
@@ -85,20 +120,17 @@ export class ReflectionAgent {
     const messages = state.messages || [];
     
     // Get the last AI message for reflection (the essay to critique)
-    const aiMessages = messages.filter(msg => msg instanceof AIMessage);
-    if (aiMessages.length === 0) {
+    const lastEssay = lastAIMessage(messages);
+    if (!lastEssay) {
       // Should never happen but just in case
       return { messages };
     }
 
-    const lastEssay = aiMessages[aiMessages.length - 1];
-
     // For the reflection, we need a message with the essay to critique
     const reflectionInput = [new HumanMessage(lastEssay.content as string)];
 
-    // Generate reflection using the reflection prompt template
-    const chain = this.reflectionPrompt.pipe(this.llm);
-    const reflection = await chain.invoke({ messages: reflectionInput });
+    // Generate reflection from the grading system prompt and the essay
+    const reflection = await this.llm.invoke([reflectionSystemMessage, ...reflectionInput]);
 
     // Add the reflection as a human message to the existing messages
     const updatedMessages = [...messages, new HumanMessage(reflection.content as string)];
@@ -106,9 +138,19 @@ export class ReflectionAgent {
     return { messages: updatedMessages };
   }
 
+  // Runs after every generate step. With maxIterations = 3:
+  //
+  //   step        messages after   iteration   action
+  //   generate    2 (q, e1)        1           reflect
+  //   reflect     3 (.., c1)       1           -> generate
+  //   generate    4 (.., e2)       2           reflect
+  //   reflect     5 (.., c2)       2           -> generate
+  //   generate    6 (.., e3)       3           END
+  //
+  // i.e. maxIterations essays and maxIterations - 1 critiques; the final essay is
+  // never critiqued, since nothing would consume that critique.
   private shouldContinue(state: ReflectionState): string {
-    const messages = state.messages || [];
-    if (messages.length >= this.maxIterations * 2) { // Each iteration adds 2 messages (AI + Human)
+    if ((state.iteration ?? 0) >= this.maxIterations) {
       return END;
     }
     return "reflect";
@@ -148,13 +190,80 @@ export class ReflectionAgent {
     return result;
   }
 
+  // Essays and critiques from one pass over the messages; the first message is the query
+  private partitionMessages(messages: BaseMessage[]): { essays: string[]; critiques: string[] } {
+    const essays: string[] = [];
+    const critiques: string[] = [];
+    for (let i = 0; i < messages.length; i++) {
+      const msg = messages[i];
+      if (msg instanceof AIMessage) {
+        essays.push(msg.content as string);
+      } else if (i >= 1 && msg instanceof HumanMessage) {
+        critiques.push(msg.content as string);
+      }
+    }
+    return { essays, critiques };
+  }
+
+  // Run the agent and return only the final essay and critiques unless raw messages are requested
+  async run(query: string, includeRaw: boolean = false): Promise<ReflectionResult> {
+    const finalState = await this.invoke({ query, messages: [], iteration: 0 });
+    const messages = finalState.messages || [];
+    const { essays, critiques } = this.partitionMessages(messages);
+
+    const result: ReflectionResult = {
+      essay: essays[essays.length - 1] ?? "No essay generated.",
+      critiques,
+      iterations: finalState.iteration ?? essays.length,
+    };
+    if (includeRaw) {
+      result.messages = messages;
+    }
+    return result;
+  }
+
+  /**
+   * Stream a run as it progresses. With a single iteration there is no critique step,
+   * so the essay is streamed token by token straight from the model; otherwise each
+   * essay and critique is emitted as soon as its graph step completes.
+   */
+  async *stream(query: string): AsyncGenerator<ReflectionStreamEvent> {
+    if (this.maxIterations <= 1) {
+      const chunks = await this.llm.stream([generateSystemMessage, new HumanMessage(query)]);
+      for await (const chunk of chunks) {
+        const content = messageText(chunk);
+        if (content) {
+          yield { type: "essay_delta", content };
+        }
+      }
+      return;
+    }
+
+    let iteration = 0;
+    const updates = await this.graph.stream(
+      { query, messages: [], iteration: 0 },
+      { streamMode: "updates" }
+    );
+    for await (const update of updates) {
+      for (const [node, change] of Object.entries(update as Record<string, Partial<ReflectionState>>)) {
+        const newest = change.messages?.[change.messages.length - 1];
+        if (!newest) {
+          continue;
+        }
+        if (node === "generate") {
+          iteration = change.iteration ?? iteration + 1;
+          yield { type: "essay", iteration, content: messageText(newest) };
+        } else {
+          yield { type: "critique", iteration, content: messageText(newest) };
+        }
+      }
+    }
+  }
+
   // Method to get the final essay from the messages
   getFinalEssay(result: ReflectionState): string {
-    const messages = result.messages || [];
-    const aiMessages = messages.filter(msg => msg instanceof AIMessage);
-    
-    if (aiMessages.length > 0) {
-      const lastEssay = aiMessages[aiMessages.length - 1];
+    const lastEssay = lastAIMessage(result.messages || []);
+    if (lastEssay) {
       return lastEssay.content as string;
     }
     
@@ -163,28 +272,23 @@ export class ReflectionAgent {
 
   // Method to get all reflections from the messages
   getReflections(result: ReflectionState): string[] {
-    const messages = result.messages || [];
-    const reflections: string[] = [];
-    
-    // Skip the first human message (the query) and look for subsequent human messages (reflections)
-    for (let i = 1; i < messages.length; i++) {
-      const msg = messages[i];
-      if (msg instanceof HumanMessage) {
-        reflections.push(msg.content as string);
-      }
-    }
-    
-    return reflections;
+    // Skip the first human message (the query); later human messages are reflections
+    return this.partitionMessages(result.messages || []).critiques;
   }
 }
 
 // Example usage
 async function main(): Promise<void> {
+  // Load environment variables here rather than at import, so importing the agent
+  // (e.g. from an MCP server) does not read .env a second time
+  config();
+
   const reflectionAgent = new ReflectionAgent("gpt-4o-mini", 3);
 
   const initialState: ReflectionState = {
     query: "Write an essay on the topicality of The Little Prince and its message in modern life",
     messages: [],
+    iteration: 0,
   };
 
   try {
@@ -211,7 +315,7 @@ async function main(): Promise<void> {
     console.log("\n📊 STATISTICS:");
     console.log("=" .repeat(50));
     console.log(`Total messages: ${finalState.messages?.length || 0}`);
-    console.log(`Iterations completed: ${Math.floor((finalState.messages?.length || 0) / 2)}`);
+    console.log(`Iterations completed: ${finalState.iteration ?? 0}`);
     console.log(`Reflection rounds: ${reflections.length}`);
 
   } catch (error) {
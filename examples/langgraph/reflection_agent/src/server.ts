@@ -0,0 +1,144 @@
+import { McpServer } from '@modelcontextprotocol/sdk/server/mcp.js';
+import { z } from 'zod';
+import {
+  batchInputSchema,
+  createBatchAdapter,
+  createLangGraphAdapter,
+  formatToolResult,
+  runServer,
+  withConcurrencyLimit,
+  type ProgressExtra
+} from 'automcp-ts';
+import { config } from 'dotenv';
+import type { ReflectionAgent } from './index.js';
+
+// Create MCP server
+const server = new McpServer({
+  name: 'Reflection Agent MCP Server',
+  version: '1.0.0'
+});
+
+const InputSchema = z.object({
+  query: z.string().describe('The essay topic or writing request'),
+  include_raw: z.boolean().optional().describe('Also return the raw graph messages'),
+  max_iterations: z.number().int().min(1).max(10).optional().describe('Essays to write before stopping (default 3)'),
+});
+
+const name = 'reflection_agent';
+const description = 'Writes an essay, then critiques and revises it over several reflection rounds';
+
+// The agent module (the OpenAI client and the compiled graph) is loaded on the
+// first tool call rather than at startup, so the server binds its transport right away.
+// The compiled graph is stateless, so one agent per iteration count is shared by
+// every later call.
+const DEFAULT_MAX_ITERATIONS = 3;
+const agentPromises = new Map<number, Promise<ReflectionAgent>>();
+
+function getReflectionAgent(maxIterations: number = DEFAULT_MAX_ITERATIONS): Promise<ReflectionAgent> {
+  let agentPromise = agentPromises.get(maxIterations);
+  if (!agentPromise) {
+    agentPromise = import('./index.js')
+      .then(({ ReflectionAgent }) => new ReflectionAgent(undefined, maxIterations))
+      .catch((error) => {
+        // Let the next call retry instead of caching the failure
+        agentPromises.delete(maxIterations);
+        throw error;
+      });
+    agentPromises.set(maxIterations, agentPromise);
+  }
+  return agentPromise;
+}
+
+// Each run is a chain of LLM calls, so concurrent clients run side by side, capped to
+// stay inside the OpenAI rate limit rather than queueing behind one another
+const MAX_CONCURRENT_RUNS = 8;
+
+// One limiter for every kind of run (plain, streamed and batch items), so together
+// they never exceed MAX_CONCURRENT_RUNS
+const runSlot = withConcurrencyLimit((task: () => Promise<unknown>) => task(), MAX_CONCURRENT_RUNS);
+
+function withRunSlot<T>(task: () => Promise<T>): Promise<T> {
+  return runSlot(task) as Promise<T>;
+}
+
+const runReflection = (input: Record<string, any>) => withRunSlot(async () =>
+  (await getReflectionAgent(input.max_iterations)).run(input.query, input.include_raw ?? false)
+);
+
+const mcpLanggraphAgent = createLangGraphAdapter(
+  { invoke: runReflection },
+  name,
+  description,
+  InputSchema
+);
+
+/**
+ * Run with progress: each essay, critique or essay fragment is sent to the client as a
+ * progress notification while the run is still going, and the usual result is
+ * returned at the end.
+ */
+const streamReflection = (
+  input: { query: string; max_iterations?: number | undefined },
+  extra: ProgressExtra & { _meta: { progressToken: string | number } }
+) => withRunSlot(async () => {
+  const agent = await getReflectionAgent(input.max_iterations);
+  const progressToken = extra._meta.progressToken;
+  const critiques: string[] = [];
+  let essay = '';
+  let iterations = 0;
+  let progress = 0;
+
+  for await (const event of agent.stream(input.query)) {
+    if (event.type === 'essay_delta') {
+      essay += event.content;
+      iterations = 1;
+    } else if (event.type === 'essay') {
+      essay = event.content;
+      iterations = event.iteration;
+    } else {
+      critiques.push(event.content);
+    }
+    progress += 1;
+    // Progress is best effort; a dropped notification must not fail the run
+    await extra.sendNotification?.({
+      method: 'notifications/progress',
+      params: { progressToken, progress, message: JSON.stringify(event) }
+    }).catch(() => undefined);
+  }
+
+  return formatToolResult({ essay, critiques, iterations });
+});
+
+// Add the tool to the server; clients that send a progress token get the run streamed
+server.tool(
+  name,
+  description,
+  InputSchema.shape,
+  (input, extra: ProgressExtra) => {
+    const progressToken = extra?._meta?.progressToken;
+    if (progressToken !== undefined && extra.sendNotification && !input.include_raw) {
+      return streamReflection(input, { ...extra, _meta: { progressToken } });
+    }
+    return mcpLanggraphAgent(input);
+  }
+);
+
+// Batch form: several essays in one MCP round trip. Each item runs through
+// runReflection and so takes a slot from the same limiter as single and streamed
+// calls; a batch running alongside them queues rather than exceeding the cap.
+server.tool(
+  `batch_${name}`,
+  'Writes several reflected essays in one call; prefer this over repeated reflection_agent calls',
+  batchInputSchema(InputSchema),
+  createBatchAdapter((item) => mcpLanggraphAgent(item), { concurrency: MAX_CONCURRENT_RUNS })
+);
+
+// Run with `tsx src/server.ts` for stdio, or `tsx src/server.ts sse` for Streamable HTTP.
+// Optional flags: --port <n>, --cache-ttl <seconds>
+if (import.meta.url === `file://${process.argv[1]}`) {
+  config();
+  runServer(server).catch((error) => {
+    process.stderr.write(`Error starting MCP server: ${error}\n`);
+    process.exit(1);
+  });
+}
@@ -5,12 +5,10 @@ import { ChatOpenAI } from '@langchain/openai';
 import { StringOutputParser } from '@langchain/core/output_parsers';
 import { ChatPromptTemplate } from '@langchain/core/prompts';
 import { BaseMessage } from '@langchain/core/messages';
+import type { Runnable } from '@langchain/core/runnables';
 import { config } from 'dotenv';
 import { z } from 'zod';
 
-// Load environment variables
-config();
-
 // Define the state schema
 const SelfDiscoverStateSchema = z.object({
   reasoning_modules: z.string(),
@@ -74,9 +72,13 @@ Follow the reasoning structure to solve this task. Provide your final answer.
 `)
 };
 
+type StageName = keyof typeof mockPrompts;
+
 export class SelfDiscoverAgent {
   private llm: ChatOpenAI;
   private graph: any;
+  // prompt | llm | parser for each stage, piped once per agent instead of on every node call
+  private chains: Record<StageName, Runnable<Record<string, any>, string>>;
 
   constructor(openaiModel: string = "gpt-4o") {
     this.llm = new ChatOpenAI({
@@ -84,15 +86,21 @@ export class SelfDiscoverAgent {
       modelName: openaiModel,
     });
 
+    const parser = new StringOutputParser();
+    this.chains = {
+      select: mockPrompts.select.pipe(this.llm).pipe(parser),
+      adapt: mockPrompts.adapt.pipe(this.llm).pipe(parser),
+      structure: mockPrompts.structure.pipe(this.llm).pipe(parser),
+      reasoning: mockPrompts.reasoning.pipe(this.llm).pipe(parser),
+    };
+
     this.initializeGraph();
   }
 
   private async select(state: SelfDiscoverState): Promise<Partial<SelfDiscoverState>> {
     console.log("📝 Selecting relevant reasoning modules...");
     
-    const chain = mockPrompts.select.pipe(this.llm).pipe(new StringOutputParser());
-    
-    const selectedModules = await chain.invoke({
+    const selectedModules = await this.chains.select.invoke({
       reasoning_modules: state.reasoning_modules,
       task_description: state.task_description,
     });
@@ -103,9 +111,7 @@ export class SelfDiscoverAgent {
   private async adapt(state: SelfDiscoverState): Promise<Partial<SelfDiscoverState>> {
     console.log("🔧 Adapting modules to the specific task...");
     
-    const chain = mockPrompts.adapt.pipe(this.llm).pipe(new StringOutputParser());
-    
-    const adaptedModules = await chain.invoke({
+    const adaptedModules = await this.chains.adapt.invoke({
       selected_modules: state.selected_modules,
       task_description: state.task_description,
     });
@@ -116,9 +122,7 @@ export class SelfDiscoverAgent {
   private async structure(state: SelfDiscoverState): Promise<Partial<SelfDiscoverState>> {
     console.log("🏗️ Creating reasoning structure...");
     
-    const chain = mockPrompts.structure.pipe(this.llm).pipe(new StringOutputParser());
-    
-    const reasoningStructure = await chain.invoke({
+    const reasoningStructure = await this.chains.structure.invoke({
       adapted_modules: state.adapted_modules,
       task_description: state.task_description,
     });
@@ -129,9 +133,7 @@ export class SelfDiscoverAgent {
   private async reason(state: SelfDiscoverState): Promise<Partial<SelfDiscoverState>> {
     console.log("🧠 Applying reasoning to solve the task...");
     
-    const chain = mockPrompts.reasoning.pipe(this.llm).pipe(new StringOutputParser());
-    
-    const answer = await chain.invoke({
+    const answer = await this.chains.reasoning.invoke({
       reasoning_structure: state.reasoning_structure,
       task_description: state.task_description,
     });
@@ -170,10 +172,39 @@ export class SelfDiscoverAgent {
     console.log("✅ Self-Discovery completed!\n");
     return result;
   }
+
+  /**
+   * Stream a run stage by stage. Each stage needs the complete output of the one
+   * before it, so the stages themselves stay sequential, but every stage's output is
+   * yielded the moment its node finishes instead of after the final answer.
+   */
+  async *stream(input: SelfDiscoverState): AsyncGenerator<{ stage: string; output: Partial<SelfDiscoverState> }> {
+    const updates = await this.graph.stream(input, { streamMode: "updates" });
+    for await (const update of updates) {
+      for (const [stage, output] of Object.entries(update as Record<string, Partial<SelfDiscoverState>>)) {
+        yield { stage, output };
+      }
+    }
+  }
+
+  /**
+   * Run several tasks concurrently. The four stages of one task stay sequential,
+   * but independent tasks overlap their OpenAI round trips instead of queueing.
+   */
+  async invokeMany(inputs: SelfDiscoverState[], maxConcurrency: number = 4): Promise<SelfDiscoverState[]> {
+    console.log(`🚀 Starting Self-Discovery Agent for ${inputs.length} tasks...\n`);
+    const results = await this.graph.batch(inputs, { maxConcurrency });
+    console.log("✅ Self-Discovery completed!\n");
+    return results;
+  }
 }
 
 // Example usage
 async function main(): Promise<void> {
+  // Load environment variables here rather than at import, so importing the agent
+  // (e.g. from an MCP server) does not read .env a second time
+  config();
+
   // Example reasoning modules
   const reasoningModules = [
     "1. How could I devise an experiment to help solve that problem?",
@@ -213,7 +244,7 @@ async function main(): Promise<void> {
     "39. Let's make a step by step plan and implement it with good notation and explanation.",
   ];
 
-  // Example task
+  // Example task, used when none is given on the command line
   const taskExample = `This SVG path element <path d="M 55.57,80.69 L 57.38,65.80 M 57.38,65.80 L 48.90,57.46 M 48.90,57.46 L
 45.58,47.78 M 45.58,47.78 L 53.25,36.07 L 66.29,48.90 L 78.69,61.09 L 55.57,80.69"/> draws a:
 (A) circle (B) heptagon (C) hexagon (D) kite (E) line (F) octagon (G) pentagon(H) rectangle (I) sector (J) triangle`;
@@ -221,21 +252,51 @@ async function main(): Promise<void> {
   // Convert reasoning modules to string
   const reasoningModulesStr = reasoningModules.join('\n');
 
+  // Headings for each stage's output, printed as soon as that stage finishes
+  const stageLabels: Record<string, [string, keyof SelfDiscoverState]> = {
+    select: ["🔍 Selected Modules", "selected_modules"],
+    adapt: ["🔧 Adapted Modules", "adapted_modules"],
+    structure: ["🏗️ Reasoning Structure", "reasoning_structure"],
+    reason: ["💡 Final Answer", "answer"],
+  };
+
+  // Tasks can be given on the command line; several are run concurrently
+  const tasks = process.argv.slice(2).filter(task => task.trim() !== "");
+
   try {
     // Run the agent
     const agent = new SelfDiscoverAgent();
-    const result = await agent.invoke({
-      task_description: taskExample,
-      reasoning_modules: reasoningModulesStr,
-    });
 
+    if (tasks.length > 1) {
+      const results = await agent.invokeMany(tasks.map(task => ({
+        task_description: task,
+        reasoning_modules: reasoningModulesStr,
+      })));
+
+      console.log("📊 Results:");
+      console.log("====================");
+      for (const result of results) {
+        console.log(`🎯 Task: ${result.task_description}`);
+        console.log(`💡 Final Answer:\n${result.answer}\n`);
+      }
+      return;
+    }
+
+    const task = tasks[0] ?? taskExample;
+    console.log("🚀 Starting Self-Discovery Agent...\n");
     console.log("📊 Results:");
     console.log("====================");
-    console.log(`🎯 Task: ${result.task_description}`);
-    console.log(`\n🔍 Selected Modules:\n${result.selected_modules}`);
-    console.log(`\n🔧 Adapted Modules:\n${result.adapted_modules}`);
-    console.log(`\n🏗️ Reasoning Structure:\n${result.reasoning_structure}`);
-    console.log(`\n💡 Final Answer:\n${result.answer}`);
+    console.log(`🎯 Task: ${task}`);
+    for await (const { stage, output } of agent.stream({
+      task_description: task,
+      reasoning_modules: reasoningModulesStr,
+    })) {
+      const label = stageLabels[stage];
+      if (label) {
+        console.log(`\n${label[0]}:\n${output[label[1]]}`);
+      }
+    }
+    console.log("\n✅ Self-Discovery completed!");
 
   } catch (error) {
     console.error("❌ Error running Self-Discovery Agent:", error);
@@ -0,0 +1,125 @@
+import { createHash } from 'crypto';
+import { mkdirSync } from 'fs';
+import { dirname, join } from 'path';
+import { OpenAIEmbedding } from '@llamaindex/openai';
+import { Database } from 'sqlite3';
+
+const DEFAULT_CACHE_PATH = join(process.cwd(), '.cache', 'embeddings.sqlite');
+
+type OpenAIEmbeddingInit = ConstructorParameters<typeof OpenAIEmbedding>[0];
+
+/**
+ * Small promise wrapper over the sqlite3 callback API, limited to what the cache needs.
+ */
+class EmbeddingStore {
+  private db: Database;
+  private ready: Promise<void>;
+
+  constructor(path: string) {
+    mkdirSync(dirname(path), { recursive: true });
+    this.db = new Database(path);
+    // WAL lets reads proceed during the occasional write; NORMAL sync is enough for a cache
+    this.ready = this.exec(`
+      PRAGMA journal_mode = WAL;
+      PRAGMA synchronous = NORMAL;
+      CREATE TABLE IF NOT EXISTS emb_cache (k TEXT PRIMARY KEY, vec BLOB NOT NULL);
+    `);
+  }
+
+  private exec(sql: string): Promise<void> {
+    return new Promise((resolve, reject) => {
+      this.db.exec(sql, (error) => (error ? reject(error) : resolve()));
+    });
+  }
+
+  async getMany(keys: string[]): Promise<Map<string, number[]>> {
+    await this.ready;
+    const found = new Map<string, number[]>();
+    if (keys.length === 0) {
+      return found;
+    }
+    const rows = await new Promise<Array<{ k: string; vec: Buffer }>>((resolve, reject) => {
+      const placeholders = keys.map(() => '?').join(', ');
+      this.db.all(
+        `SELECT k, vec FROM emb_cache WHERE k IN (${placeholders})`,
+        keys,
+        (error, result: Array<{ k: string; vec: Buffer }>) => (error ? reject(error) : resolve(result))
+      );
+    });
+    for (const row of rows) {
+      const floats = new Float32Array(row.vec.buffer, row.vec.byteOffset, row.vec.byteLength / 4);
+      found.set(row.k, Array.from(floats));
+    }
+    return found;
+  }
+
+  async putMany(entries: Array<[string, number[]]>): Promise<void> {
+    await this.ready;
+    if (entries.length === 0) {
+      return;
+    }
+    await new Promise<void>((resolve, reject) => {
+      this.db.serialize(() => {
+        this.db.run('BEGIN');
+        const stmt = this.db.prepare('INSERT OR REPLACE INTO emb_cache (k, vec) VALUES (?, ?)');
+        for (const [key, vector] of entries) {
+          stmt.run(key, Buffer.from(new Float32Array(vector).buffer));
+        }
+        stmt.finalize();
+        this.db.run('COMMIT', (error) => (error ? reject(error) : resolve()));
+      });
+    });
+  }
+}
+
+/**
+ * OpenAI embeddings with a persistent SQLite cache in front.
+ *
+ * Vectors are keyed by model and text, so restarting the agent re-reads previously
+ * embedded chunks from disk instead of sending them to OpenAI again; only texts that
+ * were never seen before reach the API.
+ */
+export class CachedOpenAIEmbedding extends OpenAIEmbedding {
+  private store: EmbeddingStore;
+
+  constructor(init?: OpenAIEmbeddingInit, cachePath: string = process.env.EMBEDDING_CACHE_PATH ?? DEFAULT_CACHE_PATH) {
+    super(init);
+    this.store = new EmbeddingStore(cachePath);
+
+    // OpenAIEmbedding defines these as instance properties, so they are wrapped here
+    // rather than overridden as methods
+    const embedBatch = this.getTextEmbeddings.bind(this);
+    this.getTextEmbeddings = (texts: string[]) => this.cachedEmbeddings(texts, embedBatch);
+    this.getTextEmbedding = async (text: string) => (await this.getTextEmbeddings([text]))[0]!;
+  }
+
+  private cacheKey(text: string): string {
+    return createHash('sha256').update(`${this.model}|${text.trim()}`).digest('hex');
+  }
+
+  private async cachedEmbeddings(
+    texts: string[],
+    embedBatch: (texts: string[]) => Promise<number[][]>
+  ): Promise<number[][]> {
+    const keys = texts.map((text) => this.cacheKey(text));
+    const cached = await this.store.getMany([...new Set(keys)]);
+
+    // Embed each missing text once, even if it appears several times in the batch
+    const missing = new Map<string, string>();
+    keys.forEach((key, index) => {
+      if (!cached.has(key) && !missing.has(key)) {
+        missing.set(key, texts[index]!);
+      }
+    });
+
+    if (missing.size > 0) {
+      const missingKeys = [...missing.keys()];
+      const vectors = await embedBatch([...missing.values()]);
+      const entries = missingKeys.map((key, index): [string, number[]] => [key, vectors[index]!]);
+      entries.forEach(([key, vector]) => cached.set(key, vector));
+      await this.store.putMany(entries);
+    }
+
+    return keys.map((key) => cached.get(key)!);
+  }
+}
@@ -1,7 +1,7 @@
 import { McpServer } from '@modelcontextprotocol/sdk/server/mcp';
-import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio';
 import { z } from 'zod';
-import { QueryAgent } from './index.js';
+import { batchInputSchema, createBatchAdapter, runServer, withResultCache } from 'automcp-ts';
+import { getQueryAgent, type QueryAgent } from './index.js';
 
 // Input schemas
 const QuerySchema = z.object({
@@ -25,103 +25,93 @@ const server = new McpServer({
 
 let queryAgent: QueryAgent | null = null;
 
-// Initialize the agent lazily
+// Initialize the agent lazily. Its query methods wait for the setup they need, so SQL
+// tools answer as soon as the seed data is in, without waiting on the vector index.
 async function getAgent(): Promise<QueryAgent> {
-  if (!queryAgent) {
-    queryAgent = new QueryAgent();
-    // Give it time to initialize
-    await new Promise(resolve => setTimeout(resolve, 3000));
-  }
+  queryAgent = getQueryAgent();
   return queryAgent;
 }
 
-// Add general query tool
-server.tool(
-  "query_agent",
-  {
-    query: z.string().describe("Natural language query for the agent")
-  },
-  async ({ query }: { query: string }) => {
-    try {
-      const agent = await getAgent();
-      const response = await agent.processQuery(query);
-      
-      return {
-        content: [{
-          type: "text",
-          text: response
-        }]
-      };
-    } catch (error) {
-      return {
-        content: [{
-          type: "text",
-          text: `Error processing query: ${error instanceof Error ? error.message : 'Unknown error'}`
-        }],
-        isError: true
-      };
-    }
-  }
-);
+interface ToolSpec<S extends z.ZodRawShape> {
+  name: string;
+  schema: z.ZodObject<S>;
+  errorLabel: string;
+  // Also register a batch_<name> tool that runs a list of inputs concurrently
+  batch?: boolean;
+  // Answer repeat calls from the result cache; only for read-only tools, since a cached
+  // write would be skipped and reads cached before it would go stale
+  cache?: boolean;
+  run: (agent: QueryAgent, args: z.infer<z.ZodObject<S>>) => Promise<unknown>;
+}
 
-// Add SQL query tool
-server.tool(
-  "query_sql",
-  {
-    query: z.string().describe("SQL query to execute against the city database")
-  },
-  async ({ query }: { query: string }) => {
-    try {
-      const agent = await getAgent();
-      const results = await agent.querySQL(query);
-      
-      return {
-        content: [{
-          type: "text",
-          text: JSON.stringify(results, null, 2)
-        }]
-      };
-    } catch (error) {
-      return {
-        content: [{
-          type: "text",
-          text: `SQL Error: ${error instanceof Error ? error.message : 'Unknown error'}`
-        }],
-        isError: true
-      };
-    }
-  }
-);
+const defineTool = <S extends z.ZodRawShape>(spec: ToolSpec<S>) => spec;
+
+// One row per tool; registration, agent lookup and error handling are shared below
+const tools = [
+  defineTool({
+    name: "query_agent",
+    schema: QuerySchema,
+    errorLabel: "Error processing query",
+    batch: true,
+    run: (agent, { query }) => agent.processQuery(query)
+  }),
+  defineTool({
+    name: "query_sql",
+    schema: SQLQuerySchema,
+    errorLabel: "SQL Error",
+    run: (agent, { query }) => agent.querySQL(query)
+  }),
+  defineTool({
+    name: "query_vector",
+    schema: VectorQuerySchema,
+    errorLabel: "Vector Search Error",
+    cache: true,
+    run: (agent, { query, topK = 3 }) => agent.queryVector(query, topK)
+  })
+];
+
+// Batch tools let a client fanning out many questions make one call, with the agent
+// working through them concurrently up to this limit
+const BATCH_CONCURRENCY = 8;
 
-// Add vector search tool
-server.tool(
-  "query_vector",
-  {
-    query: z.string().describe("Vector search query"),
-    topK: z.number().optional().describe("Number of results to return (default: 3)")
-  },
-  async ({ query, topK = 3 }: { query: string; topK?: number }) => {
+for (const { name, schema, errorLabel, batch, cache, run } of tools) {
+  const execute = async (args: any) => {
     try {
       const agent = await getAgent();
-      const results = await agent.queryVector(query, topK);
-      
+      const result = await run(agent, args);
+
       return {
         content: [{
-          type: "text",
-          text: JSON.stringify(results, null, 2)
+          type: "text" as const,
+          text: typeof result === "string" ? result : JSON.stringify(result, null, 2)
         }]
       };
     } catch (error) {
       return {
         content: [{
-          type: "text",
-          text: `Vector Search Error: ${error instanceof Error ? error.message : 'Unknown error'}`
+          type: "text" as const,
+          text: `${errorLabel}: ${error instanceof Error ? error.message : 'Unknown error'}`
         }],
         isError: true
       };
     }
+  };
+
+  // McpServer calls handlers with (args, extra); the default cache key ignores the
+  // per-request extra, so the same query from any request hits the cache
+  const handler = cache ? withResultCache(execute) : execute;
+
+  server.tool(name, schema.shape, handler);
+
+  if (batch) {
+    server.tool(
+      `batch_${name}`,
+      `Run several ${name} inputs at once; prefer this over repeated ${name} calls`,
+      batchInputSchema(schema),
+      createBatchAdapter(handler, { concurrency: BATCH_CONCURRENCY })
+    );
   }
-);
+}
 
 // Add resource for database schema
 server.resource(
@@ -174,51 +164,6 @@ server.resource(
   }
 );
 
-// Server entry points
-async function serveSSE() {
-  console.log("SSE transport not implemented in this example");
-  process.exit(1);
-}
-
-async function serveStdio() {
-  try {
-    const transport = new StdioServerTransport();
-    await server.connect(transport);
-    console.log("LlamaIndex Query Agent MCP Server running on stdio transport");
-  } catch (error) {
-    console.error("Failed to start server:", error);
-    process.exit(1);
-  }
-}
-
-// Main execution logic
-async function main() {
-  const args = process.argv.slice(2);
-  
-  if (args.length > 0 && args[0] === "sse") {
-    await serveSSE();
-  } else {
-    await serveStdio();
-  }
-}
-
-// Handle process cleanup
-process.on('SIGINT', async () => {
-  console.log('Shutting down MCP server...');
-  if (queryAgent) {
-    await queryAgent.close();
-  }
-  process.exit(0);
-});
-
-process.on('SIGTERM', async () => {
-  console.log('Shutting down MCP server...');
-  if (queryAgent) {
-    await queryAgent.close();
-  }
-  process.exit(0);
-});
-
 // Handle process errors
 process.on('unhandledRejection', (error) => {
   console.error('Unhandled rejection:', error);
@@ -230,8 +175,10 @@ process.on('uncaughtException', (error) => {
   process.exit(1);
 });
 
-// Run the server
-main().catch((error) => {
-  console.error('Failed to start MCP server:', error);
+// Run the server: `node dist/run-mcp.js` for stdio, or `node dist/run-mcp.js sse` for
+// Streamable HTTP. Optional flags: --port <n>, --cache-ttl <seconds>
+// runServer owns SIGINT/SIGTERM and waits for the agent to close before exiting
+runServer(server, { onShutdown: () => queryAgent?.close() }).catch((error) => {
+  process.stderr.write(`Error starting MCP server: ${error}\n`);
   process.exit(1);
-}); 
\ No newline at end of file
+});
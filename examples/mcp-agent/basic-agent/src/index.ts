@@ -1,7 +1,7 @@
 import 'dotenv/config';
 import { McpServer } from '@modelcontextprotocol/sdk/server/mcp';
-import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio';
 import { z } from 'zod';
+import { runServer } from 'automcp-ts';
 
 // Configuration settings (equivalent to Python settings)
 interface Settings {
@@ -91,18 +91,14 @@ server.resource(
   })
 );
 
-// Initialize and start the server
-async function main() {
-  const transport = new StdioServerTransport();
-  await server.connect(transport);
-  console.log("MCP Basic Agent server running on stdio transport");
-}
-
 // Handle errors
 process.on('unhandledRejection', (error) => {
   console.error('Unhandled rejection:', error);
   process.exit(1);
 });
 
-// Start the server
-main().catch(console.error); 
\ No newline at end of file
+// Start the server: stdio by default, or `sse` for Streamable HTTP
+runServer(server).catch((error) => {
+  process.stderr.write(`Error starting MCP server: ${error}\n`);
+  process.exit(1);
+});
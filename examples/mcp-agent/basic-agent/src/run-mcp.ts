@@ -1,6 +1,6 @@
 import { McpServer } from '@modelcontextprotocol/sdk/server/mcp';
-import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio';
 import { z } from 'zod';
+import { runServer } from 'automcp-ts';
 
 // Input schema for the agent (equivalent to Python InputSchema)
 const InputSchema = z.object({
@@ -36,36 +36,6 @@ server.tool(
   }
 );
 
-// Server entry points
-async function serveSSE() {
-  // For HTTP/SSE transport, you would set up an Express server
-  // This is a placeholder for now
-  console.log("SSE transport not implemented in this basic example");
-  process.exit(1);
-}
-
-async function serveStdio() {
-  try {
-    const transport = new StdioServerTransport();
-    await server.connect(transport);
-    console.log("MCP Server running on stdio transport");
-  } catch (error) {
-    console.error("Failed to start server:", error);
-    process.exit(1);
-  }
-}
-
-// Main execution logic
-async function main() {
-  const args = process.argv.slice(2);
-  
-  if (args.length > 0 && args[0] === "sse") {
-    await serveSSE();
-  } else {
-    await serveStdio();
-  }
-}
-
 // Handle process errors
 process.on('unhandledRejection', (error) => {
   console.error('Unhandled rejection:', error);
@@ -77,8 +47,9 @@ process.on('uncaughtException', (error) => {
   process.exit(1);
 });
 
-// Run the server
-main().catch((error) => {
-  console.error('Failed to start MCP server:', error);
+// Run the server: stdio by default, or `sse` for Streamable HTTP.
+// Optional flags: --port <n>, --cache-ttl <seconds>
+runServer(server).catch((error) => {
+  process.stderr.write(`Error starting MCP server: ${error}\n`);
   process.exit(1);
-}); 
\ No newline at end of file
+});
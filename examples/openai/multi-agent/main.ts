@@ -22,36 +22,62 @@ interface ToolConfig {
   toolDescription: string;
 }
 
+// One OpenAI client for every agent in the process: its connection pool and TLS
+// sessions are reused across agents and requests instead of being rebuilt per agent
+let sharedClient: OpenAI | undefined;
+
+function getOpenAIClient(): OpenAI {
+  sharedClient ??= new OpenAI({
+    apiKey: process.env.OPENAI_API_KEY,
+  });
+  return sharedClient;
+}
+
+// Every agent-as-tool takes the same single `message` argument
+const MESSAGE_TOOL_PARAMETERS = {
+  type: 'object',
+  properties: {
+    message: {
+      type: 'string',
+      description: 'The message to translate',
+    },
+  },
+  required: ['message'],
+};
+
 class Agent {
   private client: OpenAI;
   private name: string;
   private instructions: string;
   private handoffDescription: string;
+  private tools = new Map<string, OpenAI.Chat.Completions.ChatCompletionTool>();
 
   constructor(config: AgentConfig) {
-    this.client = new OpenAI({
-      apiKey: process.env.OPENAI_API_KEY,
-    });
+    this.client = getOpenAIClient();
     this.name = config.name;
     this.instructions = config.instructions;
     this.handoffDescription = config.handoffDescription;
   }
 
+  private messagesFor(message: string): OpenAI.Chat.Completions.ChatCompletionMessageParam[] {
+    return [
+      {
+        role: 'system',
+        content: this.instructions,
+      },
+      {
+        role: 'user',
+        content: message,
+      },
+    ];
+  }
+
   // Convert Python method to TypeScript
   async run(message: string): Promise<string> {
     try {
       const completion = await this.client.chat.completions.create({
         model: 'gpt-4o-mini',
-        messages: [
-          {
-            role: 'system',
-            content: this.instructions,
-          },
-          {
-            role: 'user',
-            content: message,
-          },
-        ],
+        messages: this.messagesFor(message),
         temperature: 0.7,
       });
 
@@ -61,25 +87,47 @@ class Agent {
     }
   }
 
+  /**
+   * Like `run`, but yields the reply as it is generated, so callers can show the
+   * first words without waiting for the whole completion.
+   */
+  async *stream(message: string): AsyncGenerator<string> {
+    try {
+      const stream = await this.client.chat.completions.create({
+        model: 'gpt-4o-mini',
+        messages: this.messagesFor(message),
+        temperature: 0.7,
+        stream: true,
+      });
+
+      for await (const chunk of stream) {
+        const delta = chunk.choices[0]?.delta?.content;
+        if (delta) {
+          yield delta;
+        }
+      }
+    } catch (error) {
+      throw new Error(`Agent ${this.name} failed: ${error}`);
+    }
+  }
+
   // Convert Python as_tool method to TypeScript
+  // Tool definitions are built once per name and description, then reused
   asTool(config: ToolConfig): OpenAI.Chat.Completions.ChatCompletionTool {
-    return {
-      type: 'function',
-      function: {
-        name: config.toolName,
-        description: config.toolDescription,
-        parameters: {
-          type: 'object',
-          properties: {
-            message: {
-              type: 'string',
-              description: 'The message to translate',
-            },
-          },
-          required: ['message'],
+    const key = `${config.toolName}\n${config.toolDescription}`;
+    let tool = this.tools.get(key);
+    if (!tool) {
+      tool = {
+        type: 'function',
+        function: {
+          name: config.toolName,
+          description: config.toolDescription,
+          parameters: MESSAGE_TOOL_PARAMETERS,
         },
-      },
-    };
+      };
+      this.tools.set(key, tool);
+    }
+    return tool;
   }
 
   getName(): string {
@@ -92,18 +140,12 @@ class Agent {
 }
 
 class Runner {
-  private client: OpenAI;
-
-  constructor() {
-    this.client = new OpenAI({
-      apiKey: process.env.OPENAI_API_KEY,
-    });
-  }
+  // Runners hold no per-run state, so every run goes through the same instance
+  private static shared = new Runner();
 
   // Convert Python static method to TypeScript
   static async run(orchestratorAgent: Agent, message: string): Promise<{ finalOutput: string }> {
-    const runner = new Runner();
-    return runner.runAgent(orchestratorAgent, message);
+    return Runner.shared.runAgent(orchestratorAgent, message);
   }
 
   private async runAgent(agent: Agent, message: string): Promise<{ finalOutput: string }> {
@@ -116,41 +158,52 @@ class Runner {
   }
 }
 
+interface TranslatorAgentSet {
+  spanishAgent: Agent;
+  frenchAgent: Agent;
+  italianAgent: Agent;
+  orchestratorAgent: Agent;
+}
+
 class TranslatorAgent {
   private spanishAgent: Agent;
   private frenchAgent: Agent;
   private italianAgent: Agent;
   private orchestratorAgent: Agent;
 
+  // Agents hold only their prompts and the shared OpenAI client, so every
+  // TranslatorAgent reuses one set, built the first time one is constructed
+  private static sharedAgents: TranslatorAgentSet | undefined;
+
   constructor() {
-    this.initializeAgents();
+    const agents = TranslatorAgent.sharedAgents ??= TranslatorAgent.createAgents();
+    this.spanishAgent = agents.spanishAgent;
+    this.frenchAgent = agents.frenchAgent;
+    this.italianAgent = agents.italianAgent;
+    this.orchestratorAgent = agents.orchestratorAgent;
   }
 
-  private initializeTranslatorAgents(): void {
-    this.spanishAgent = new Agent({
+  private static createAgents(): TranslatorAgentSet {
+    const spanishAgent = new Agent({
       name: 'spanish_agent',
       instructions: 'You translate the user\'s message to Spanish',
       handoffDescription: 'An english to spanish translator',
     });
 
-    this.frenchAgent = new Agent({
+    const frenchAgent = new Agent({
       name: 'french_agent',
       instructions: 'You translate the user\'s message to French',
       handoffDescription: 'An english to french translator',
     });
 
-    this.italianAgent = new Agent({
+    const italianAgent = new Agent({
       name: 'italian_agent',
       instructions: 'You translate the user\'s message to Italian',
       handoffDescription: 'An english to italian translator',
     });
-  }
-
-  private initializeOrchestratorAgent(): void {
-    this.initializeTranslatorAgents();
 
     // Create a simplified orchestrator that manages translations
-    this.orchestratorAgent = new Agent({
+    const orchestratorAgent = new Agent({
       name: 'orchestrator_agent',
       instructions: `You are a translation orchestrator. You coordinate translation tasks.
         When a user asks for translations, you handle the request by calling the appropriate translation agents.
@@ -163,10 +216,8 @@ class TranslatorAgent {
         3. Return the translated text clearly labeled by language`,
       handoffDescription: 'A translation orchestrator that coordinates multiple translation agents',
     });
-  }
 
-  private initializeAgents(): void {
-    this.initializeOrchestratorAgent();
+    return { spanishAgent, frenchAgent, italianAgent, orchestratorAgent };
   }
 
   getOrchestratorAgent(): Agent {
@@ -175,9 +226,7 @@ class TranslatorAgent {
 
   // Method to handle translation requests more directly in TypeScript
   async processTranslationRequest(message: string, targetLanguages: string[]): Promise<Record<string, string>> {
-    const translations: Record<string, string> = {};
-
-    for (const language of targetLanguages) {
+    const jobs = targetLanguages.map((language) => {
       let agent: Agent;
       switch (language.toLowerCase()) {
         case 'spanish':
@@ -192,15 +241,23 @@ class TranslatorAgent {
         default:
           throw new Error(`Unsupported language: ${language}`);
       }
+      return { language, agent };
+    });
 
+    // The translations do not depend on each other, so request them all at once:
+    // the whole call takes as long as the slowest language, not the sum of them
+    const results = await Promise.all(jobs.map(async ({ language, agent }) => {
       try {
-        const translation = await agent.run(message);
-        translations[language] = translation;
+        return await agent.run(message);
       } catch (error) {
-        translations[language] = `Error translating to ${language}: ${error}`;
+        return `Error translating to ${language}: ${error}`;
       }
-    }
+    }));
 
+    const translations: Record<string, string> = {};
+    jobs.forEach(({ language }, index) => {
+      translations[language] = results[index]!;
+    });
     return translations;
   }
 }
@@ -221,55 +278,95 @@ function askQuestion(rl: readline.Interface, question: string): Promise<string>
   });
 }
 
+/**
+ * Answer one request: the orchestrator reply, plus direct translations when the
+ * request names languages.
+ */
+async function handleRequest(translator: TranslatorAgent, userInput: string): Promise<void> {
+  const lowerInput = userInput.toLowerCase();
+  const wantsDirectTranslation = lowerInput.includes('spanish') ||
+    lowerInput.includes('french') ||
+    lowerInput.includes('italian');
+
+  // Extract the text to translate (simplified parsing)
+  const textMatch = userInput.match(/"([^"]+)"/);
+  const textToTranslate = textMatch?.[1] ?? 'Hello, how are you?';
+
+  // Extract target languages (simplified parsing)
+  const targetLanguages: string[] = [];
+  if (lowerInput.includes('spanish')) targetLanguages.push('Spanish');
+  if (lowerInput.includes('french')) targetLanguages.push('French');
+  if (lowerInput.includes('italian')) targetLanguages.push('Italian');
+
+  if (targetLanguages.length === 0) {
+    targetLanguages.push('Spanish'); // Default
+  }
+
+  // The direct translations do not depend on the orchestrator's answer, so they
+  // start right away and run while the orchestrator is still working. The outcome
+  // is captured as a value so a failure surfaces below, not as an unhandled rejection.
+  const directTranslations = wantsDirectTranslation
+    ? translator.processTranslationRequest(textToTranslate, targetLanguages).then(
+        (translations) => ({ ok: true as const, translations }),
+        (error: unknown) => ({ ok: false as const, error })
+      )
+    : undefined;
+
+  // Run the entire orchestration in a single trace, printing the reply as it streams in
+  process.stdout.write('Final result: ');
+  for await (const delta of translator.getOrchestratorAgent().stream(userInput)) {
+    process.stdout.write(delta);
+  }
+  process.stdout.write('\n');
+
+  // Example of direct translation handling
+  if (directTranslations) {
+    console.log('\n--- Direct Translation Example ---');
+
+    const outcome = await directTranslations;
+    if (outcome.ok) {
+      console.log(`\nTranslations for: "${textToTranslate}"`);
+      for (const [language, translation] of Object.entries(outcome.translations)) {
+        console.log(`${language}: ${translation}`);
+      }
+    } else {
+      console.error('Translation error:', outcome.error);
+    }
+  }
+}
+
 // Main function (converted from Python's async main)
 async function main(): Promise<void> {
   const rl = createReadlineInterface();
+  // With --interactive, requests are answered until an empty line or "exit"; the
+  // agents, the OpenAI client and its open connections are reused for every request
+  const interactive = process.argv.includes('--interactive') || process.argv.includes('-i');
 
   try {
-    const userInput = await askQuestion(
+    const translator = new TranslatorAgent();
+    let userInput = await askQuestion(
       rl,
       'Hi! What would you like translated, and to which languages? '
     );
 
-    // Run the entire orchestration in a single trace
-    const translator = new TranslatorAgent();
-    const orchestratorResult = await Runner.run(translator.getOrchestratorAgent(), userInput);
-    
-    console.log(`Final result: ${orchestratorResult.finalOutput}`);
-
-    // Example of direct translation handling
-    if (userInput.toLowerCase().includes('spanish') || 
-        userInput.toLowerCase().includes('french') || 
-        userInput.toLowerCase().includes('italian')) {
-      
-      console.log('\n--- Direct Translation Example ---');
-      
-      // Extract the text to translate (simplified parsing)
-      const textMatch = userInput.match(/"([^"]+)"/);
-      const textToTranslate = textMatch ? textMatch[1] : 'Hello, how are you?';
-      
-      // Extract target languages (simplified parsing)
-      const targetLanguages: string[] = [];
-      if (userInput.toLowerCase().includes('spanish')) targetLanguages.push('Spanish');
-      if (userInput.toLowerCase().includes('french')) targetLanguages.push('French');
-      if (userInput.toLowerCase().includes('italian')) targetLanguages.push('Italian');
-      
-      if (targetLanguages.length === 0) {
-        targetLanguages.push('Spanish'); // Default
-      }
-
+    while (true) {
       try {
-        const translations = await translator.processTranslationRequest(textToTranslate, targetLanguages);
-        
-        console.log(`\nTranslations for: "${textToTranslate}"`);
-        for (const [language, translation] of Object.entries(translations)) {
-          console.log(`${language}: ${translation}`);
-        }
+        await handleRequest(translator, userInput);
       } catch (error) {
-        console.error('Translation error:', error);
+        if (!interactive) {
+          throw error;
+        }
+        console.error('Error:', error);
       }
-    }
 
+      if (!interactive) {
+        break;
+      }
+      userInput = await askQuestion(rl, '\n> ');
+      if (!userInput.trim() || userInput.trim().toLowerCase() === 'exit') {
+        break;
+      }
+    }
   } catch (error) {
     console.error('Error:', error);
     process.exit(1);
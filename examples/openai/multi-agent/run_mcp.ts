@@ -1,10 +1,26 @@
 import { Server } from '@modelcontextprotocol/sdk/server/index.js';
-import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio.js';
-import { CallToolRequestSchema, ListToolsRequestSchema } from '@modelcontextprotocol/sdk/types.js';
+import {
+  CallToolRequestSchema,
+  ListResourcesRequestSchema,
+  ListToolsRequestSchema,
+  ReadResourceRequestSchema,
+  type Tool,
+} from '@modelcontextprotocol/sdk/types.js';
 import { z } from 'zod';
 
 // Import our translator agent
-import { TranslatorAgent } from './main.js';
+import type { TranslatorAgent } from './main.js';
+import {
+  batchInputSchema,
+  createBatchAdapter,
+  runServer,
+  stableArgsKey,
+  toolMetrics,
+  withResultCache,
+  withToolMetrics,
+  type ProgressExtra,
+  type ToolResult,
+} from 'automcp-ts';
 
 // Create MCP server
 const server = new Server(
@@ -15,6 +31,7 @@ const server = new Server(
   {
     capabilities: {
       tools: {},
+      resources: {},
     },
   }
 );
@@ -27,86 +44,205 @@ const InputSchema = z.object({
 
 type InputType = z.infer<typeof InputSchema>;
 
-// Create the translator agent instance
-const translatorAgent = new TranslatorAgent();
-const orchestratorAgent = translatorAgent.getOrchestratorAgent();
+const BatchInputSchema = z.object(batchInputSchema(InputSchema));
+
+// The translator module (the OpenAI SDK and dotenv) is loaded on the first tool call
+// rather than at startup, so the server answers the MCP handshake right away.
+// One agent instance serves every later call.
+let translatorAgentPromise: Promise<TranslatorAgent> | undefined;
+
+function getTranslatorAgent(): Promise<TranslatorAgent> {
+  translatorAgentPromise ??= import('./main.js')
+    .then(({ TranslatorAgent }) => new TranslatorAgent())
+    .catch((error) => {
+      // Let the next call retry instead of caching the failure
+      translatorAgentPromise = undefined;
+      throw error;
+    });
+  return translatorAgentPromise;
+}
 
 const toolName = 'translator_agent';
 const toolDescription = 'A translator agent that translates text from English to French, Italian, and Spanish';
+const batchToolName = `batch_${toolName}`;
+
+// Concurrent translation requests per batch call, kept well inside the OpenAI rate limit
+const BATCH_CONCURRENCY = 8;
+
+const messageInputSchema = {
+  type: 'object' as const,
+  properties: {
+    message: {
+      type: 'string',
+      description: 'The message to translate',
+    },
+    languages: {
+      type: 'array',
+      items: {
+        type: 'string',
+      },
+      description: 'Target languages (Spanish, French, Italian)',
+    },
+  },
+  required: ['message'],
+};
+
+// Tool listings are fixed, so they are built once here rather than on every
+// tools/list request
+const tools: Tool[] = [
+  {
+    name: toolName,
+    description: toolDescription,
+    inputSchema: messageInputSchema,
+  },
+  {
+    name: batchToolName,
+    description: 'Translates several messages in one call; prefer this over repeated translator_agent calls',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        items: {
+          type: 'array',
+          items: messageInputSchema,
+          minItems: 1,
+          description: 'Inputs to run; prefer one batch call over several single calls',
+        },
+      },
+      required: ['items'],
+    },
+  },
+];
 
 // Add tool handlers
-server.setRequestHandler(ListToolsRequestSchema, async () => {
+server.setRequestHandler(ListToolsRequestSchema, async () => ({ tools }));
+
+/**
+ * Run one translation request: direct per-language translation when languages are
+ * given, otherwise the orchestrator agent.
+ */
+async function runTranslation(input: InputType): Promise<ToolResult> {
+  let result: string;
+  let failed = false;
+
+  if (input.languages && input.languages.length > 0) {
+    // Use direct translation method
+    try {
+      const translatorAgent = await getTranslatorAgent();
+      const translations = await translatorAgent.processTranslationRequest(
+        input.message,
+        input.languages
+      );
+      
+      const translationResults = Object.entries(translations)
+        .map(([lang, translation]) => `${lang}: ${translation}`)
+        .join('\n');
+      
+      result = `Translations for "${input.message}":\n${translationResults}`;
+    } catch (error) {
+      result = `Translation error: ${error instanceof Error ? error.message : 'Unknown error'}`;
+      failed = true;
+    }
+  } else {
+    // Use orchestrator agent for general handling
+    try {
+      const translatorAgent = await getTranslatorAgent();
+      const agentResult = await translatorAgent.getOrchestratorAgent().run(input.message);
+      result = agentResult;
+    } catch (error) {
+      result = `Agent error: ${error instanceof Error ? error.message : 'Unknown error'}`;
+      failed = true;
+    }
+  }
+
   return {
-    tools: [
+    content: [
       {
-        name: toolName,
-        description: toolDescription,
-        inputSchema: {
-          type: 'object',
-          properties: {
-            message: {
-              type: 'string',
-              description: 'The message to translate',
-            },
-            languages: {
-              type: 'array',
-              items: {
-                type: 'string',
-              },
-              description: 'Target languages (Spanish, French, Italian)',
-            },
-          },
-          required: ['message'],
-        },
+        type: 'text',
+        text: result,
       },
     ],
+    ...(failed ? { isError: true } : {}),
   };
-});
+}
+
+// Identical requests are answered from memory for the cache TTL (10 minutes by
+// default, or --cache-ttl), skipping every LLM round trip. Language names are
+// matched case-insensitively, so "Spanish" and "spanish" share an entry; failed
+// runs are only kept briefly.
+// Latency is measured outside the cache, so the metrics show what clients see
+const translate = withToolMetrics(withResultCache(runTranslation, {
+  key: ([input]) => stableArgsKey([{
+    message: input.message,
+    languages: input.languages?.map((language: string) => language.trim().toLowerCase()),
+  }]),
+}), { name: toolName });
 
-server.setRequestHandler(CallToolRequestSchema, async (request) => {
+/**
+ * Orchestrator run with progress: each reply fragment is sent to the client as a
+ * progress notification as soon as it arrives, and the full reply is returned at the
+ * end, so the client sees the first words instead of waiting for the whole answer.
+ */
+async function runStreamedOrchestrator(
+  message: string,
+  extra: ProgressExtra & { _meta: { progressToken: string | number } }
+): Promise<ToolResult> {
+  const progressToken = extra._meta.progressToken;
+  let result = '';
+  let progress = 0;
+
+  try {
+    const translatorAgent = await getTranslatorAgent();
+    for await (const delta of translatorAgent.getOrchestratorAgent().stream(message)) {
+      result += delta;
+      progress += 1;
+      // Progress is best effort; a dropped notification must not fail the run
+      await extra.sendNotification?.({
+        method: 'notifications/progress',
+        params: { progressToken, progress, message: delta }
+      }).catch(() => undefined);
+    }
+  } catch (error) {
+    return {
+      content: [{ type: 'text', text: `Agent error: ${error instanceof Error ? error.message : 'Unknown error'}` }],
+      isError: true,
+    };
+  }
+
+  return {
+    content: [
+      {
+        type: 'text',
+        text: result || 'No response generated',
+      },
+    ],
+  };
+}
+
+const streamOrchestrator = withToolMetrics(runStreamedOrchestrator, { name: toolName });
+
+// Batch form: every message in one MCP round trip, translated concurrently
+const batchTranslate = withToolMetrics(createBatchAdapter(
+  (item: unknown) => translate(InputSchema.parse(item)),
+  { concurrency: BATCH_CONCURRENCY }
+), { name: batchToolName });
+
+server.setRequestHandler(CallToolRequestSchema, async (request, extra) => {
   const { name, arguments: args } = request.params;
 
-  if (name === toolName) {
+  if (name === toolName || name === batchToolName) {
     try {
+      const progressExtra = extra as ProgressExtra;
+      if (name === batchToolName) {
+        return await batchTranslate(BatchInputSchema.parse(args), progressExtra);
+      }
       // Validate input using Zod schema
-      const validatedInput = InputSchema.parse(args);
-      
-      let result: string;
-
-      if (validatedInput.languages && validatedInput.languages.length > 0) {
-        // Use direct translation method
-        try {
-          const translations = await translatorAgent.processTranslationRequest(
-            validatedInput.message,
-            validatedInput.languages
-          );
-          
-          const translationResults = Object.entries(translations)
-            .map(([lang, translation]) => `${lang}: ${translation}`)
-            .join('\n');
-          
-          result = `Translations for "${validatedInput.message}":\n${translationResults}`;
-        } catch (error) {
-          result = `Translation error: ${error instanceof Error ? error.message : 'Unknown error'}`;
-        }
-      } else {
-        // Use orchestrator agent for general handling
-        try {
-          const agentResult = await orchestratorAgent.run(validatedInput.message);
-          result = agentResult;
-        } catch (error) {
-          result = `Agent error: ${error instanceof Error ? error.message : 'Unknown error'}`;
-        }
+      const input = InputSchema.parse(args);
+      // Clients that send a progress token get orchestrator replies streamed
+      const progressToken = progressExtra._meta?.progressToken;
+      if (progressToken !== undefined && progressExtra.sendNotification && !input.languages?.length) {
+        return await streamOrchestrator(input.message, { ...progressExtra, _meta: { progressToken } });
       }
-      
-      return {
-        content: [
-          {
-            type: 'text',
-            text: result,
-          },
-        ],
-      };
+      return await translate(input);
     } catch (error) {
       return {
         content: [
@@ -123,49 +259,43 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
   throw new Error(`Unknown tool: ${name}`);
 });
 
-// Server entrypoints
-async function serveStdio(): Promise<void> {
-  // Suppress console.error to prevent warnings from corrupting STDIO
-  const originalConsoleError = console.error;
-  console.error = () => {}; // Ignore all error outputs
+// Per-tool call counts and latencies, for spotting a slow model or upstream API
+const METRICS_URI = 'metrics://tools';
 
-  try {
-    const transport = new StdioServerTransport();
-    await server.connect(transport);
-    
-    // Keep the server running
-    await new Promise(() => {}); // Run indefinitely
-  } finally {
-    // Restore console.error for normal operation
-    console.error = originalConsoleError;
-  }
-}
-
-async function serveSSE(): Promise<void> {
-  // Note: SSE transport would require additional setup
-  // For now, we'll just log that SSE is not implemented
-  console.error('SSE transport not implemented in this example');
-  console.error('Use STDIO transport instead');
-  process.exit(1);
-}
+server.setRequestHandler(ListResourcesRequestSchema, async () => ({
+  resources: [
+    {
+      uri: METRICS_URI,
+      name: 'Tool Metrics',
+      description: 'Call counts, error counts and latency percentiles for each tool',
+      mimeType: 'application/json',
+    },
+  ],
+}));
 
-// Main execution
-async function main(): Promise<void> {
-  const args = process.argv.slice(2);
-  
-  if (args.length > 0 && args[0] === 'sse') {
-    await serveSSE();
-  } else {
-    await serveStdio();
+server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
+  const { uri } = request.params;
+  if (uri !== METRICS_URI) {
+    throw new Error(`Unknown resource: ${uri}`);
   }
-}
+  return {
+    contents: [
+      {
+        uri,
+        mimeType: 'application/json',
+        text: JSON.stringify(toolMetrics.snapshot(), null, 2),
+      },
+    ],
+  };
+});
 
-// Execute if this is the main module
+// Run with `tsx run_mcp.ts` for stdio, or `tsx run_mcp.ts sse` for Streamable HTTP.
+// Optional flags: --port <n>, --cache-ttl <seconds>
 if (import.meta.url === `file://${process.argv[1]}`) {
-  main().catch((error) => {
-    console.error('Failed to start server:', error);
+  runServer(server).catch((error) => {
+    process.stderr.write(`Error starting MCP server: ${error}\n`);
     process.exit(1);
   });
 }
 
-export { server, translatorAgent }; 
\ No newline at end of file
+export { server, getTranslatorAgent }; 
\ No newline at end of file
@@ -1,8 +1,36 @@
-import axios from 'axios';
+import axios, { type AxiosError, type InternalAxiosRequestConfig } from 'axios';
 import * as dotenv from 'dotenv';
+import { Agent as HttpsAgent } from 'https';
+import { withResultCache, withToolMetrics } from 'automcp-ts';
 
 dotenv.config();
 
+// One HTTP client for both weather tools. Keep-alive sockets are reused across calls,
+// so repeat lookups skip the TCP and TLS handshakes, and a stalled API fails after
+// ten seconds instead of holding the tool call open.
+const http = axios.create({
+  timeout: 10_000,
+  httpsAgent: new HttpsAgent({ keepAlive: true, maxSockets: 20 }),
+});
+
+// Both APIs are plain GETs, so transient failures (network errors, 429, 5xx) are
+// retried a couple of times with a short exponential backoff before the tool fails
+const MAX_HTTP_RETRIES = 2;
+const HTTP_RETRY_BACKOFF_MS = 200;
+
+http.interceptors.response.use(undefined, async (error: AxiosError) => {
+  const config = error.config as (InternalAxiosRequestConfig & { retryCount?: number }) | undefined;
+  const status = error.response?.status;
+  const retryable = status === undefined || status === 429 || status >= 500;
+  const attempt = config?.retryCount ?? 0;
+  if (!config || !retryable || attempt >= MAX_HTTP_RETRIES) {
+    throw error;
+  }
+  config.retryCount = attempt + 1;
+  await new Promise(resolve => setTimeout(resolve, HTTP_RETRY_BACKOFF_MS * 2 ** attempt));
+  return http.request(config);
+});
+
 // TypeScript interfaces for type safety (converted from Python dict[str, type] patterns)
 interface Coordinates {
   lat: number;
@@ -28,6 +56,34 @@ interface WeatherApiResponse {
   };
 }
 
+// Weather code lookup (converted from Python dict), built once for the module
+// rather than on every getWeather call
+const WEATHER_CODE_DESCRIPTIONS: Readonly<Record<number, string>> = Object.freeze({
+  1000: 'Clear, Sunny',
+  1100: 'Mostly Clear',
+  1101: 'Partly Cloudy',
+  1102: 'Mostly Cloudy',
+  1001: 'Cloudy',
+  2000: 'Fog',
+  2100: 'Light Fog',
+  4000: 'Drizzle',
+  4001: 'Rain',
+  4200: 'Light Rain',
+  4201: 'Heavy Rain',
+  5000: 'Snow',
+  5001: 'Flurries',
+  5100: 'Light Snow',
+  5101: 'Heavy Snow',
+  6000: 'Freezing Drizzle',
+  6001: 'Freezing Rain',
+  6200: 'Light Freezing Rain',
+  6201: 'Heavy Freezing Rain',
+  7000: 'Ice Pellets',
+  7101: 'Heavy Ice Pellets',
+  7102: 'Light Ice Pellets',
+  8000: 'Thunderstorm',
+});
+
 // Simple agent context interface (replacing pydantic_ai patterns)
 interface AgentContext {
   retries: number;
@@ -48,6 +104,22 @@ class WeatherAgent {
   constructor(model: string, systemPrompt: string, retries: number = 2) {
     this.systemPrompt = systemPrompt;
     this.maxRetries = retries;
+
+    // Repeat lookups within the TTL are answered from memory instead of another HTTPS
+    // round trip. Places do not move, so geocodes are kept for a day; current weather
+    // for five minutes. Failures are not cached, so runSync's retries still reach the API.
+    // Metrics are recorded inside the cache, so they time the API calls themselves.
+    this.getLatLng = withResultCache(withToolMetrics(this.getLatLng.bind(this), { name: 'getLatLng' }), {
+      ttlMs: 24 * 60 * 60_000,
+      maxSize: 1024,
+      key: ([locationDescription]) => String(locationDescription).trim().toLowerCase(),
+      errorTtlMs: 0,
+    });
+    this.getWeather = withResultCache(withToolMetrics(this.getWeather.bind(this), { name: 'getWeather' }), {
+      ttlMs: 5 * 60_000,
+      maxSize: 1024,
+      errorTtlMs: 0,
+    });
   }
 
   // Convert Python decorator pattern to TypeScript method
@@ -64,7 +136,7 @@ class WeatherAgent {
     }
 
     try {
-      const response = await axios.get<GeoApiResponse[]>('https://geocode.maps.co/search', {
+      const response = await http.get<GeoApiResponse[]>('https://geocode.maps.co/search', {
         params: {
           q: locationDescription,
           api_key: process.env.GEO_API_KEY
@@ -104,7 +176,7 @@ class WeatherAgent {
     }
 
     try {
-      const response = await axios.get<WeatherApiResponse>('https://api.tomorrow.io/v4/weather/realtime', {
+      const response = await http.get<WeatherApiResponse>('https://api.tomorrow.io/v4/weather/realtime', {
         params: {
           apikey: process.env.WEATHER_API_KEY,
           location: `${lat},${lng}`,
@@ -113,37 +185,10 @@ class WeatherAgent {
       });
 
       const values = response.data.data.values;
-      
-      // Weather code lookup (converted from Python dict)
-      const codeLookup: Record<number, string> = {
-        1000: 'Clear, Sunny',
-        1100: 'Mostly Clear',
-        1101: 'Partly Cloudy',
-        1102: 'Mostly Cloudy',
-        1001: 'Cloudy',
-        2000: 'Fog',
-        2100: 'Light Fog',
-        4000: 'Drizzle',
-        4001: 'Rain',
-        4200: 'Light Rain',
-        4201: 'Heavy Rain',
-        5000: 'Snow',
-        5001: 'Flurries',
-        5100: 'Light Snow',
-        5101: 'Heavy Snow',
-        6000: 'Freezing Drizzle',
-        6001: 'Freezing Rain',
-        6200: 'Light Freezing Rain',
-        6201: 'Heavy Freezing Rain',
-        7000: 'Ice Pellets',
-        7101: 'Heavy Ice Pellets',
-        7102: 'Light Ice Pellets',
-        8000: 'Thunderstorm',
-      };
 
       return {
         temperature: `${Math.round(values.temperatureApparent)}°C`,
-        description: codeLookup[values.weatherCode] || 'Unknown',
+        description: WEATHER_CODE_DESCRIPTIONS[values.weatherCode] || 'Unknown',
       };
     } catch (error) {
       throw new Error(`Weather API error: ${error}`);
@@ -151,6 +196,21 @@ class WeatherAgent {
   }
 
   // Simplified agent run method (replacing pydantic_ai agent patterns)
+  // Geocode a location phrase as a whole first, so names like "Trinidad and Tobago"
+  // stay intact. Only when that finds nothing is "Tokyo and Paris" or "Tokyo & Paris"
+  // treated as several locations.
+  private async locate(phrase: string): Promise<Array<{ location: string; coords: Coordinates }>> {
+    try {
+      return [{ location: phrase, coords: await this.getLatLng(phrase) }];
+    } catch (error) {
+      const parts = phrase.split(/\s*(?:\band\b|&)\s*/i).filter(Boolean);
+      if (!(error instanceof ModelRetryError) || parts.length < 2) {
+        throw error;
+      }
+      return Promise.all(parts.map(async (location) => ({ location, coords: await this.getLatLng(location) })));
+    }
+  }
+
   async runSync(query: string): Promise<{ data: string }> {
     let attempts = 0;
     
@@ -159,15 +219,24 @@ class WeatherAgent {
         // Simple query processing - in a real implementation, 
         // this would integrate with an LLM service
         if (query.toLowerCase().includes('weather')) {
-          // Extract location from query (simplified approach)
+          // Extract locations from query (simplified approach); "Tokyo; Paris" asks for two
           const locationMatch = query.match(/weather (?:in|at) ([^?]+)/i);
-          const location = locationMatch ? locationMatch[1].trim() : 'London';
-          
-          const coords = await this.getLatLng(location);
-          const weather = await this.getWeather(coords.lat, coords.lng);
-          
+          const requested = (locationMatch?.[1] ?? '')
+            .split(';')
+            .map(location => location.trim())
+            .filter(Boolean);
+          const phrases = requested.length > 0 ? requested : ['London'];
+
+          // Each location only depends on its own geocode, so the lookups for different
+          // locations run side by side instead of one after another
+          const located = (await Promise.all(phrases.map(phrase => this.locate(phrase)))).flat();
+          const reports = await Promise.all(located.map(async ({ location, coords }) => {
+            const weather = await this.getWeather(coords.lat, coords.lng);
+            return `${location} is ${weather.temperature} and ${weather.description}`;
+          }));
+
           return {
-            data: `The weather in ${location} is ${weather.temperature} and ${weather.description}.`
+            data: `The weather in ${reports.join(', and in ')}.`
           };
         }
         
@@ -186,14 +255,12 @@ class WeatherAgent {
   }
 }
 
+// Kept to one line: it is sent with every request, and a short prompt costs fewer
+// input tokens than anything prompt caching would save on a prompt this small
+const WEATHER_SYSTEM_PROMPT = 'Use getLatLng then getWeather for each location; reply in one sentence.';
+
 // Create the weather agent (converted from Python global variable pattern)
-const weatherAgent = new WeatherAgent(
-  'openai:gpt-4o-mini',
-  'Be concise, reply with one sentence. ' +
-  'Use the getLatLng tool to get the latitude and longitude of the locations, ' +
-  'then use the getWeather tool to get the weather.',
-  2
-);
+const weatherAgent = new WeatherAgent('openai:gpt-4o-mini', WEATHER_SYSTEM_PROMPT, 2);
 
 // Main execution (converted from Python if __name__ == '__main__' pattern)
 async function main() {
@@ -211,4 +278,4 @@ if (import.meta.url === `file://${process.argv[1]}`) {
   main();
 }
 
-export { WeatherAgent, type Coordinates, type WeatherData }; 
\ No newline at end of file
+export { WeatherAgent, WEATHER_SYSTEM_PROMPT, type Coordinates, type WeatherData }; 
\ No newline at end of file
@@ -1,10 +1,17 @@
 import { Server } from '@modelcontextprotocol/sdk/server/index.js';
-import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio.js';
-import { CallToolRequestSchema, ListToolsRequestSchema } from '@modelcontextprotocol/sdk/types.js';
+import {
+  CallToolRequestSchema,
+  ListResourcesRequestSchema,
+  ListToolsRequestSchema,
+  ReadResourceRequestSchema,
+  type CallToolResult,
+  type Tool,
+} from '@modelcontextprotocol/sdk/types.js';
 import { z } from 'zod';
 
 // Import our weather agent
-import { WeatherAgent } from './main.js';
+import type { WeatherAgent } from './main.js';
+import { runServer, toolMetrics, withToolMetrics } from 'automcp-ts';
 
 // Create MCP server
 const server = new Server(
@@ -15,6 +22,7 @@ const server = new Server(
   {
     capabilities: {
       tools: {},
+      resources: {},
     },
   }
 );
@@ -26,118 +34,126 @@ const InputSchema = z.object({
 
 type InputType = z.infer<typeof InputSchema>;
 
-// Create the weather agent instance
-const weatherAgent = new WeatherAgent(
-  'openai:gpt-4o-mini',
-  'Be concise, reply with one sentence. ' +
-  'Use the getLatLng tool to get the latitude and longitude of the locations, ' +
-  'then use the getWeather tool to get the weather.',
-  2
-);
+// The weather module (axios and dotenv) is loaded on the first tool call rather than
+// at startup, so the server answers the MCP handshake right away. One agent instance
+// serves every later call.
+let weatherAgentPromise: Promise<WeatherAgent> | undefined;
+
+function getWeatherAgent(): Promise<WeatherAgent> {
+  weatherAgentPromise ??= import('./main.js')
+    .then(({ WeatherAgent, WEATHER_SYSTEM_PROMPT }) => new WeatherAgent('openai:gpt-4o-mini', WEATHER_SYSTEM_PROMPT, 2))
+    .catch((error) => {
+      // Let the next call retry instead of caching the failure
+      weatherAgentPromise = undefined;
+      throw error;
+    });
+  return weatherAgentPromise;
+}
 
 const toolName = 'weather_agent';
 const toolDescription = 'A weather agent that can help you get the weather of a city';
 
-// Add tool handlers
-server.setRequestHandler(ListToolsRequestSchema, async () => {
-  return {
-    tools: [
-      {
-        name: toolName,
-        description: toolDescription,
-        inputSchema: {
-          type: 'object',
-          properties: {
-            query: {
-              type: 'string',
-              description: 'The weather query to process',
-            },
-          },
-          required: ['query'],
+// Tool listings are fixed, so they are built once here rather than on every
+// tools/list request
+const tools: Tool[] = [
+  {
+    name: toolName,
+    description: toolDescription,
+    inputSchema: {
+      type: 'object',
+      properties: {
+        query: {
+          type: 'string',
+          description: 'The weather query to process',
         },
       },
-    ],
-  };
-});
+      required: ['query'],
+    },
+  },
+];
+
+// Add tool handlers
+server.setRequestHandler(ListToolsRequestSchema, async () => ({ tools }));
+
+// Answer one weather_agent call; calls are timed for the metrics resource below
+const runWeatherTool = withToolMetrics(async (args: unknown): Promise<CallToolResult> => {
+  try {
+    // Validate input using Zod schema
+    const validatedInput = InputSchema.parse(args);
+
+    // Call the weather agent
+    const weatherAgent = await getWeatherAgent();
+    const result = await weatherAgent.runSync(validatedInput.query);
+
+    return {
+      content: [
+        {
+          type: 'text',
+          text: result.data,
+        },
+      ],
+    };
+  } catch (error) {
+    return {
+      content: [
+        {
+          type: 'text',
+          text: `Error: ${error instanceof Error ? error.message : 'Unknown error'}`,
+        },
+      ],
+      isError: true,
+    };
+  }
+}, { name: toolName });
 
 server.setRequestHandler(CallToolRequestSchema, async (request) => {
   const { name, arguments: args } = request.params;
 
   if (name === toolName) {
-    try {
-      // Validate input using Zod schema
-      const validatedInput = InputSchema.parse(args);
-      
-      // Call the weather agent
-      const result = await weatherAgent.runSync(validatedInput.query);
-      
-      return {
-        content: [
-          {
-            type: 'text',
-            text: result.data,
-          },
-        ],
-      };
-    } catch (error) {
-      return {
-        content: [
-          {
-            type: 'text',
-            text: `Error: ${error instanceof Error ? error.message : 'Unknown error'}`,
-          },
-        ],
-        isError: true,
-      };
-    }
+    return await runWeatherTool(args);
   }
 
   throw new Error(`Unknown tool: ${name}`);
 });
 
-// Server entrypoints
-async function serveStdio(): Promise<void> {
-  // Suppress console.error to prevent warnings from corrupting STDIO
-  const originalConsoleError = console.error;
-  console.error = () => {}; // Ignore all error outputs
-
-  try {
-    const transport = new StdioServerTransport();
-    await server.connect(transport);
-    
-    // Keep the server running
-    await new Promise(() => {}); // Run indefinitely
-  } finally {
-    // Restore console.error for normal operation
-    console.error = originalConsoleError;
-  }
-}
-
-async function serveSSE(): Promise<void> {
-  // Note: SSE transport would require additional setup
-  // For now, we'll just log that SSE is not implemented
-  console.error('SSE transport not implemented in this example');
-  console.error('Use STDIO transport instead');
-  process.exit(1);
-}
+// Per-tool call counts and latencies, including the geocoding and weather API calls
+// that miss the cache, for spotting a slow upstream
+const METRICS_URI = 'metrics://tools';
+
+server.setRequestHandler(ListResourcesRequestSchema, async () => ({
+  resources: [
+    {
+      uri: METRICS_URI,
+      name: 'Tool Metrics',
+      description: 'Call counts, error counts and latency percentiles for each tool',
+      mimeType: 'application/json',
+    },
+  ],
+}));
 
-// Main execution
-async function main(): Promise<void> {
-  const args = process.argv.slice(2);
-  
-  if (args.length > 0 && args[0] === 'sse') {
-    await serveSSE();
-  } else {
-    await serveStdio();
+server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
+  const { uri } = request.params;
+  if (uri !== METRICS_URI) {
+    throw new Error(`Unknown resource: ${uri}`);
   }
-}
+  return {
+    contents: [
+      {
+        uri,
+        mimeType: 'application/json',
+        text: JSON.stringify(toolMetrics.snapshot(), null, 2),
+      },
+    ],
+  };
+});
 
-// Execute if this is the main module
+// Run with `tsx run_mcp.ts` for stdio, or `tsx run_mcp.ts sse` for Streamable HTTP.
+// Optional flags: --port <n>, --cache-ttl <seconds>
 if (import.meta.url === `file://${process.argv[1]}`) {
-  main().catch((error) => {
-    console.error('Failed to start server:', error);
+  runServer(server).catch((error) => {
+    process.stderr.write(`Error starting MCP server: ${error}\n`);
     process.exit(1);
   });
 }
 
-export { server, weatherAgent }; 
\ No newline at end of file
+export { server, getWeatherAgent }; 
\ No newline at end of file
@@ -126,7 +126,7 @@ export abstract class BaseAdapter<T extends InputSchemaType> {
         text:
           typeof serializedResult === 'string'
             ? serializedResult
-            : JSON.stringify(serializedResult, null, 2)
+            : JSON.stringify(serializedResult)
       }]
     };
 
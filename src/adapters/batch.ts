@@ -0,0 +1,172 @@
+import { z, type AnyZodObject, type ZodTypeAny } from 'zod';
+import { ToolResult } from './base.js';
+import { ensureSerializable, formatToolResult } from './utils.js';
+
+const DEFAULT_BATCH_CONCURRENCY = 8;
+
+export interface BatchAdapterOptions {
+  /** Maximum number of items dispatched to the wrapped tool at once. */
+  concurrency?: number;
+}
+
+/**
+ * The subset of the MCP request context a batch tool uses to report progress.
+ */
+export interface ProgressExtra {
+  _meta?: { progressToken?: string | number };
+  sendNotification?: (notification: {
+    method: 'notifications/progress';
+    params: { progressToken: string | number; progress: number; total?: number; message?: string };
+  }) => Promise<void>;
+}
+
+export interface BatchItemResult {
+  index: number;
+  ok: boolean;
+  output?: any;
+  error?: string;
+}
+
+/**
+ * Map over items with at most `limit` calls in flight, preserving input order in the result.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: ReadonlyArray<T>,
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+
+  const worker = async (): Promise<void> => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index] as T, index);
+    }
+  };
+
+  const workers = Math.max(1, Math.min(limit, items.length));
+  await Promise.all(Array.from({ length: workers }, worker));
+  return results;
+}
+
+/**
+ * Cap how many calls of a tool run at once across all callers; extra calls wait in
+ * FIFO order. Wrap each upstream separately so each keeps its own quota.
+ */
+export function withConcurrencyLimit<A extends any[], R>(
+  fn: (...args: A) => R | Promise<R>,
+  limit: number
+): (...args: A) => Promise<R> {
+  let active = 0;
+  const waiting: Array<() => void> = [];
+
+  const release = (): void => {
+    const next = waiting.shift();
+    if (next) {
+      // Hand the slot straight to the next waiter without decrementing
+      next();
+    } else {
+      active -= 1;
+    }
+  };
+
+  const limited = async (...args: A): Promise<R> => {
+    if (active < limit) {
+      active += 1;
+    } else {
+      await new Promise<void>((resolve) => waiting.push(resolve));
+    }
+    try {
+      return await fn(...args);
+    } finally {
+      release();
+    }
+  };
+
+  Object.defineProperty(limited, 'name', { value: fn.name });
+  Object.defineProperty(limited, 'description', { value: (fn as { description?: string }).description });
+
+  return limited;
+}
+
+/**
+ * Build the input schema for a batch tool: an `items` array of the single-call input.
+ */
+export function batchInputSchema(itemSchema: AnyZodObject | Record<string, ZodTypeAny>) {
+  const item = itemSchema instanceof z.ZodObject ? itemSchema : z.object(itemSchema);
+  return {
+    items: z.array(item).min(1).describe('Inputs to run; prefer one batch call over several single calls')
+  };
+}
+
+function itemOutput(result: ToolResult): any {
+  if (result.structuredContent !== undefined) {
+    return result.structuredContent;
+  }
+  return result.content.map(part => part.text).join('\n');
+}
+
+/**
+ * Wrap a single-call tool so one MCP call can run a list of inputs concurrently.
+ *
+ * Items are dispatched with bounded concurrency and reported individually, so one
+ * failing item does not fail the whole batch. When the client supplies a progress
+ * token, each finished item is also sent as a progress notification, letting the
+ * client act on early results before the whole batch completes.
+ */
+export function createBatchAdapter(
+  tool: (...args: any[]) => ToolResult | Promise<ToolResult>,
+  options: BatchAdapterOptions = {}
+): (...args: any[]) => Promise<ToolResult> {
+  const concurrency = options.concurrency ?? DEFAULT_BATCH_CONCURRENCY;
+
+  const runBatch = async (...args: any[]): Promise<ToolResult> => {
+    const [input, extra] = args as [any, ProgressExtra | undefined];
+    const items: any[] = Array.isArray(input) ? input : (input?.items ?? []);
+    const progressToken = extra?._meta?.progressToken;
+    let completed = 0;
+
+    const runItem = async (item: any, index: number): Promise<BatchItemResult> => {
+      try {
+        const result = await tool(item);
+        return result.isError
+          ? { index, ok: false, error: result.content.map(part => part.text).join('\n') }
+          : { index, ok: true, output: itemOutput(result) };
+      } catch (error) {
+        return { index, ok: false, error: error instanceof Error ? error.message : String(error) };
+      }
+    };
+
+    const results = await mapWithConcurrency(items, concurrency, async (item, index) => {
+      const itemResult = await runItem(item, index);
+      completed += 1;
+      if (progressToken !== undefined && extra?.sendNotification) {
+        // Progress is best effort; a dropped notification must not fail the batch
+        await extra.sendNotification({
+          method: 'notifications/progress',
+          params: {
+            progressToken,
+            progress: completed,
+            total: items.length,
+            message: JSON.stringify(ensureSerializable(itemResult))
+          }
+        }).catch(() => undefined);
+      }
+      return itemResult;
+    });
+
+    const toolResult = formatToolResult(ensureSerializable({ results }));
+    if (results.length > 0 && results.every(result => !result.ok)) {
+      toolResult.isError = true;
+    }
+    return toolResult;
+  };
+
+  Object.defineProperty(runBatch, 'name', { value: `batch_${tool.name}` });
+  Object.defineProperty(runBatch, 'description', {
+    value: `Batch form of ${tool.name}: runs several inputs concurrently in one call.`
+  });
+
+  return runBatch;
+}
@@ -0,0 +1,224 @@
+import { isRequestExtra } from './utils.js';
+
+const DEFAULT_TTL_SECONDS = 600;
+const DEFAULT_MAX_SIZE = 512;
+const DEFAULT_EMPTY_TTL_MS = 5 * 60_000;
+const DEFAULT_ERROR_TTL_MS = 30_000;
+
+export interface ResultCacheOptions {
+  /** How long a result stays fresh. Defaults to `AUTOMCP_CACHE_TTL` seconds, or 10 minutes. */
+  ttlMs?: number;
+  /** Maximum number of cached results before the least recently used one is evicted. */
+  maxSize?: number;
+  /** Derive the cache key from the call arguments. Defaults to `stableArgsKey`. */
+  key?: (args: any[]) => string;
+  /** How long an empty result is kept. Defaults to 5 minutes, capped at `ttlMs`. */
+  emptyTtlMs?: number;
+  /**
+   * How long a failure (a thrown error or an `isError` tool result) is kept, so retries
+   * during an upstream outage do not all reach it. May depend on the error, e.g. to let
+   * rate-limit errors expire sooner. Defaults to 30 seconds, capped at `ttlMs`.
+   */
+  errorTtlMs?: number | ((error: unknown) => number);
+  /** Decide whether a result counts as empty. */
+  isEmpty?: (value: any) => boolean;
+}
+
+type CacheEntry<R> =
+  | { ok: true; value: R; expiresAt: number }
+  | { ok: false; error: unknown; expiresAt: number };
+
+/**
+ * Read the default cache TTL from the environment, in milliseconds.
+ */
+export function defaultCacheTtlMs(): number {
+  const raw = process.env.AUTOMCP_CACHE_TTL;
+  const seconds = raw === undefined ? NaN : Number(raw);
+  return (Number.isFinite(seconds) && seconds >= 0 ? seconds : DEFAULT_TTL_SECONDS) * 1000;
+}
+
+function normalizeForKey(value: any): any {
+  if (typeof value === 'string') {
+    return value.trim();
+  }
+  if (Array.isArray(value)) {
+    return value.map(normalizeForKey);
+  }
+  if (value && typeof value === 'object' && value.constructor === Object) {
+    const sorted: Record<string, any> = {};
+    for (const key of Object.keys(value).sort()) {
+      sorted[key] = normalizeForKey(value[key]);
+    }
+    return sorted;
+  }
+  return value;
+}
+
+function isBlank(value: any): boolean {
+  if (value === null || value === undefined) {
+    return true;
+  }
+  if (typeof value === 'string') {
+    return value.trim() === '';
+  }
+  if (Array.isArray(value)) {
+    return value.length === 0;
+  }
+  if (typeof value === 'object' && value.constructor === Object) {
+    return Object.keys(value).length === 0;
+  }
+  return false;
+}
+
+/**
+ * Default emptiness check: nullish, blank strings, empty arrays/objects, and tool
+ * results whose structured or text content is one of those.
+ */
+export function isEmptyResult(value: any): boolean {
+  if (value && typeof value === 'object' && Array.isArray(value.content)) {
+    if (value.structuredContent !== undefined) {
+      return isBlank(value.structuredContent);
+    }
+    return value.content.every((part: { text?: string }) => {
+      const text = part.text?.trim() ?? '';
+      return text === '' || text === '[]' || text === '{}' || text === 'null';
+    });
+  }
+  return isBlank(value);
+}
+
+/**
+ * Build a stable cache key from call arguments: object keys are sorted and strings trimmed.
+ *
+ * A trailing request context, which `McpServer` passes after the tool arguments and
+ * which carries a per-request id, is left out so repeat calls map to the same key.
+ * Strings keep their case, since searches, code and paths are often case-sensitive;
+ * pass a custom `key` to fold case for tools where it does not matter.
+ */
+export function stableArgsKey(args: any[]): string {
+  const callArgs = args.length > 0 && isRequestExtra(args[args.length - 1]) ? args.slice(0, -1) : args;
+  return JSON.stringify(normalizeForKey(callArgs));
+}
+
+export interface SingleflightOptions {
+  /** Derive the deduplication key from the call arguments. Defaults to `stableArgsKey`. */
+  key?: (args: any[]) => string;
+}
+
+/**
+ * Coalesce concurrent identical calls: while a call is in flight, callers with the
+ * same key await its promise instead of running the tool again.
+ */
+export function withSingleflight<A extends any[], R>(
+  fn: (...args: A) => R | Promise<R>,
+  options: SingleflightOptions = {}
+): (...args: A) => Promise<R> {
+  const keyFor = options.key ?? stableArgsKey;
+  const inflight = new Map<string, Promise<R>>();
+
+  const coalesced = (...args: A): Promise<R> => {
+    const key = keyFor(args);
+    const pending = inflight.get(key);
+    if (pending) {
+      return pending;
+    }
+    const promise = (async () => {
+      try {
+        return await fn(...args);
+      } finally {
+        inflight.delete(key);
+      }
+    })();
+    inflight.set(key, promise);
+    return promise;
+  };
+
+  Object.defineProperty(coalesced, 'name', { value: fn.name });
+  Object.defineProperty(coalesced, 'description', { value: (fn as { description?: string }).description });
+
+  return coalesced;
+}
+
+/**
+ * Wrap a tool function with an in-process LRU + TTL result cache.
+ *
+ * Repeat calls with equivalent arguments are answered from memory instead of
+ * re-running the agent or hitting the network again. Concurrent misses for the
+ * same key share a single underlying call. Empty results and failures are cached
+ * too, for shorter periods, so repeated retries do not keep reaching the upstream.
+ */
+export function withResultCache<A extends any[], R>(
+  fn: (...args: A) => R | Promise<R>,
+  options: ResultCacheOptions = {}
+): (...args: A) => Promise<R> {
+  // The environment default is read on first use so a server's --cache-ttl flag,
+  // applied after tools are wrapped at module load, still takes effect.
+  let ttls: { fresh: number; empty: number } | undefined;
+  const resolveTtls = (): { fresh: number; empty: number } => {
+    if (!ttls) {
+      const fresh = options.ttlMs ?? defaultCacheTtlMs();
+      ttls = { fresh, empty: Math.min(options.emptyTtlMs ?? DEFAULT_EMPTY_TTL_MS, fresh) };
+    }
+    return ttls;
+  };
+  const maxSize = options.maxSize ?? DEFAULT_MAX_SIZE;
+  const keyFor = options.key ?? stableArgsKey;
+  const errorTtl = options.errorTtlMs ?? DEFAULT_ERROR_TTL_MS;
+  const errorTtlFor = (error: unknown): number =>
+    Math.min(typeof errorTtl === 'function' ? errorTtl(error) : errorTtl, resolveTtls().fresh);
+  const isEmpty = options.isEmpty ?? isEmptyResult;
+  const entries = new Map<string, CacheEntry<R>>();
+  const load = withSingleflight(fn, { key: keyFor });
+
+  const store = (key: string, entry: CacheEntry<R>, lifetimeMs: number): void => {
+    if (lifetimeMs <= 0 || maxSize <= 0) {
+      return;
+    }
+    entry.expiresAt = Date.now() + lifetimeMs;
+    entries.set(key, entry);
+    if (entries.size > maxSize) {
+      const oldest = entries.keys().next().value;
+      if (oldest !== undefined) {
+        entries.delete(oldest);
+      }
+    }
+  };
+
+  const cached = async (...args: A): Promise<R> => {
+    const { fresh, empty } = resolveTtls();
+    const key = keyFor(args);
+    const now = Date.now();
+    const hit = entries.get(key);
+    if (hit) {
+      entries.delete(key);
+      if (hit.expiresAt > now) {
+        // Re-insert so Map iteration order tracks recency.
+        entries.set(key, hit);
+        if (hit.ok) {
+          return hit.value;
+        }
+        throw hit.error;
+      }
+    }
+
+    let value: R;
+    try {
+      value = await load(...args);
+    } catch (error) {
+      store(key, { ok: false, error, expiresAt: 0 }, errorTtlFor(error));
+      throw error;
+    }
+
+    const lifetimeMs = (value as { isError?: boolean } | null)?.isError
+      ? errorTtlFor(value)
+      : isEmpty(value) ? empty : fresh;
+    store(key, { ok: true, value, expiresAt: 0 }, lifetimeMs);
+    return value;
+  };
+
+  // Keep the wrapped tool's metadata so registration code sees the same name/description
+  Object.defineProperty(cached, 'name', { value: fn.name });
+  Object.defineProperty(cached, 'description', { value: (fn as { description?: string }).description });
+
+  return cached;
+}
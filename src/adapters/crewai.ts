@@ -1,4 +1,12 @@
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  muteConsole,
+  unmuteConsole,
+  type SchemaLike
+} from './utils.js';
 import { ToolResult } from './base.js';
 
 interface CrewAIResult {
@@ -7,52 +15,41 @@ interface CrewAIResult {
 }
 
 interface CrewAIAgent {
-  kickoff(inputs: Record<string, any>): CrewAIResult;
+  kickoff(inputs: Record<string, any>): CrewAIResult | Promise<CrewAIResult>;
 }
 
 /**
  * Convert a CrewAI class to an MCP tool.
+ *
+ * `kickoff` is awaited, so a crew doing network-bound work leaves the server
+ * free to handle other tool calls in the meantime.
  */
 export function createCrewAIAdapter(
   agentInstance: CrewAIAgent,
   name: string,
   description: string,
   inputSchema: SchemaLike
-): (...args: any[]) => ToolResult {
-  const runAgent = (...args: any[]): ToolResult => {
+): (...args: any[]) => Promise<ToolResult> {
+  const parseInput = compileInputSchema(inputSchema);
+
+  const runAgent = async (...args: any[]): Promise<ToolResult> => {
     const kwargs = extractParamsFromArgs(args, inputSchema);
-    const parsedInputs = parseInputWithSchema(inputSchema, kwargs);
+    const parsedInputs = parseInput(kwargs);
     const normalizedInputs = parsedInputs && typeof parsedInputs === 'object'
       ? parsedInputs
       : kwargs;
 
-    // Redirect stdout equivalent (capture console output)
-    const originalLog = console.log;
-    const originalWarn = console.warn;
-    const originalError = console.error;
-    const outputBuffer: string[] = [];
-    
-    // Override console methods to capture output
-    console.log = (...args) => outputBuffer.push(args.join(' '));
-    console.warn = (...args) => outputBuffer.push(args.join(' '));
-    console.error = (...args) => outputBuffer.push(args.join(' '));
+    muteConsole();
 
     try {
       // Execute CrewAI kickoff
-      const result = agentInstance.kickoff({ inputs: normalizedInputs });
+      const result = await agentInstance.kickoff({ inputs: normalizedInputs });
       const serializedResult = typeof result?.model_dump === 'function'
         ? result.model_dump()
         : result;
-      const outputObj = ensureSerializable(serializedResult);
-      return {
-        content: [{ type: 'text', text: JSON.stringify(outputObj, null, 2) }],
-        structuredContent: outputObj
-      };
+      return formatToolResult(ensureSerializable(serializedResult));
     } finally {
-      // Restore original console methods
-      console.log = originalLog;
-      console.warn = originalWarn;
-      console.error = originalError;
+      unmuteConsole();
     }
   };
   
@@ -71,10 +68,10 @@ export function createTypedCrewAIAdapter<T extends Record<string, any>>(
   name: string,
   description: string,
   inputSchema: SchemaLike
-): (input: T) => ToolResult {
+): (input: T) => Promise<ToolResult> {
   const adapter = createCrewAIAdapter(agentInstance, name, description, inputSchema);
 
-  return (input: T): ToolResult => {
+  return (input: T): Promise<ToolResult> => {
     return adapter(input);
   };
 }
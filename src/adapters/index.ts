@@ -11,4 +11,9 @@ export * from './langgraph.js';
 export * from './base.js';
 export * from './express.js';
 
+// Tool wrappers
+export * from './cache.js';
+export * from './batch.js';
+export * from './metrics.js';
+
 // Common utility types are exported by their respective modules
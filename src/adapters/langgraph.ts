@@ -1,4 +1,12 @@
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  muteConsole,
+  unmuteConsole,
+  type SchemaLike
+} from './utils.js';
 import { ToolResult } from './base.js';
 
 interface BaseModel {
@@ -10,6 +18,24 @@ interface LangGraphAgent {
   invoke?(input: Record<string, any>): Promise<any>;
 }
 
+type GraphInvoke = (input: Record<string, any>) => Promise<any>;
+
+/**
+ * Pick the graph's entry point once, preferring `ainvoke`, so tool calls go straight
+ * to a bound function instead of probing the agent on every request.
+ */
+function resolveGraphInvoke(agentInstance: LangGraphAgent): GraphInvoke {
+  if (typeof agentInstance.ainvoke === 'function') {
+    return agentInstance.ainvoke.bind(agentInstance);
+  }
+  if (typeof agentInstance.invoke === 'function') {
+    return agentInstance.invoke.bind(agentInstance);
+  }
+  return async () => {
+    throw new Error('Provided LangGraph agent does not implement invoke or ainvoke');
+  };
+}
+
 /**
  * Convert a LangGraph agent/graph to an MCP tool.
  */
@@ -19,46 +45,23 @@ export function createLangGraphAdapter(
   description: string,
   inputSchema?: SchemaLike
 ): (...args: any[]) => Promise<ToolResult> {
+  const parseInput = compileInputSchema(inputSchema);
+  const invokeGraph = resolveGraphInvoke(agentInstance);
+
   const runAgent = async (...args: any[]): Promise<ToolResult> => {
     const params = extractParamsFromArgs(args, inputSchema);
-    const inputDict = parseInputWithSchema(inputSchema, params);
+    const inputDict = parseInput(params);
     const effectiveInput = inputDict && typeof inputDict === 'object'
       ? inputDict
       : params;
 
-    // Capture console output to avoid interfering with transports
-    const originalLog = console.log;
-    const originalWarn = console.warn;
-    const originalError = console.error;
-    const outputBuffer: string[] = [];
-
-    console.log = (...a) => outputBuffer.push(a.join(' '));
-    console.warn = (...a) => outputBuffer.push(a.join(' '));
-    console.error = (...a) => outputBuffer.push(a.join(' '));
+    muteConsole();
 
     try {
-      // Call invoke/ainvoke depending on availability
-      let result: any;
-      if (typeof agentInstance.ainvoke === 'function') {
-        result = await agentInstance.ainvoke(effectiveInput);
-      } else if (typeof agentInstance.invoke === 'function') {
-        result = await agentInstance.invoke(effectiveInput);
-      } else {
-        throw new Error('Provided LangGraph agent does not implement invoke or ainvoke');
-      }
-
-      const output = ensureSerializable(result);
-      if (output && typeof output === 'object') {
-        return {
-          content: [{ type: 'text', text: JSON.stringify(output, null, 2) }],
-          structuredContent: output
-        };
-      }
-      return { content: [{ type: 'text', text: String(output) }] };
+      const result = await invokeGraph(effectiveInput);
+      return formatToolResult(ensureSerializable(result));
     } finally {
-      console.log = originalLog;
-      console.warn = originalWarn;
-      console.error = originalError;
+      unmuteConsole();
     }
   };
 
@@ -1,5 +1,13 @@
 import { ToolResult } from './base.js';
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  muteConsole,
+  unmuteConsole,
+  type SchemaLike
+} from './utils.js';
 
 interface BaseModel {
   [key: string]: any;
@@ -11,6 +19,36 @@ interface LlamaIndexAgentLike {
   chat?(input: any): Promise<any>;
 }
 
+type AgentCall = (params: any) => Promise<any>;
+
+function queryInputOf(params: any): any {
+  return params && typeof params === 'object'
+    ? (params as Record<string, any>).query ?? params
+    : params;
+}
+
+/**
+ * Pick the agent's entry point (chat, then query, then run) once, so each tool call
+ * dispatches through a bound function instead of probing the agent again.
+ */
+function resolveAgentCall(agentInstance: LlamaIndexAgentLike): AgentCall {
+  if (typeof agentInstance.chat === 'function') {
+    const chat = agentInstance.chat.bind(agentInstance);
+    return (params) => chat(queryInputOf(params));
+  }
+  if (typeof agentInstance.query === 'function') {
+    const query = agentInstance.query.bind(agentInstance);
+    return (params) => query(queryInputOf(params));
+  }
+  if (typeof agentInstance.run === 'function') {
+    const run = agentInstance.run.bind(agentInstance);
+    return (params) => run(...(Array.isArray(params) ? params : Object.values(params)));
+  }
+  return async () => {
+    throw new Error('Unsupported LlamaIndex agent type: expected chat, query, or run');
+  };
+}
+
 /**
  * Convert LlamaIndex agents to an MCP tool
  */
@@ -20,56 +58,23 @@ export function createLlamaIndexAdapter(
   description: string,
   inputSchema?: SchemaLike,
 ): (...args: any[]) => Promise<ToolResult> {
+  const parseInput = compileInputSchema(inputSchema);
+  const callAgent = resolveAgentCall(agentInstance);
+
   const runAgent = async (...args: any[]): Promise<ToolResult> => {
     const params = extractParamsFromArgs(args, inputSchema);
-    const parsedParams = parseInputWithSchema(inputSchema, params);
+    const parsedParams = parseInput(params);
     const effectiveParams = parsedParams && typeof parsedParams === 'object'
       ? parsedParams
       : params;
 
-    // Capture console noise
-    const originalLog = console.log;
-    const originalWarn = console.warn;
-    const originalError = console.error;
-
-    console.log = () => {};
-    console.warn = () => {};
-    console.error = () => {};
+    muteConsole();
 
     try {
-      // Determine best method
-      let response: any;
-      if (typeof agentInstance.chat === 'function') {
-        const queryInput = effectiveParams && typeof effectiveParams === 'object'
-          ? (effectiveParams as Record<string, any>).query ?? effectiveParams
-          : effectiveParams;
-        response = await agentInstance.chat(queryInput);
-      } else if (typeof agentInstance.query === 'function') {
-        const queryInput = effectiveParams && typeof effectiveParams === 'object'
-          ? (effectiveParams as Record<string, any>).query ?? effectiveParams
-          : effectiveParams;
-        response = await agentInstance.query(queryInput);
-      } else if (typeof agentInstance.run === 'function') {
-        const inputValues = Array.isArray(effectiveParams)
-          ? effectiveParams
-          : Object.values(effectiveParams);
-        response = await agentInstance.run(...inputValues);
-      } else {
-        throw new Error('Unsupported LlamaIndex agent type: expected chat, query, or run');
-      }
-
-      if (response && typeof response === 'object') {
-        const output = ensureSerializable(response);
-        return {
-          content: [{ type: 'text', text: JSON.stringify(output, null, 2) }],
-          structuredContent: output
-        };
-      }
-      return { content: [{ type: 'text', text: String(response) }] };
+      const response = await callAgent(effectiveParams);
+      return formatToolResult(ensureSerializable(response));
     } finally {
-      console.log = originalLog;
-      console.warn = originalWarn;
-      console.error = originalError;
+      unmuteConsole();
     }
   };
 
@@ -1,5 +1,11 @@
 import { ToolResult } from './base.js';
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  type SchemaLike
+} from './utils.js';
 
 interface BaseModel {
   [key: string]: any;
@@ -17,6 +23,10 @@ type AppInitializeFn = (app: any) => Promise<void>;
 
 /**
  * Convert a MCP agent instance to an MCP tool with proper isolation from MCP's task management.
+ *
+ * The app is initialized and the LLM attached once, on the first call; later calls
+ * reuse the attached LLM and only run the query. A failed initialization is retried
+ * on the next call.
  */
 export function createMcpAgentAdapter(
   agentInstance: AgentInstance,
@@ -27,10 +37,25 @@ export function createMcpAgentAdapter(
   description: string,
   inputSchema: SchemaLike
 ): (...args: any[]) => Promise<ToolResult> {
+  const parseInput = compileInputSchema(inputSchema);
+
+  // Shared by every call, including concurrent first calls, so setup runs once
+  let attached: Promise<LLMInstance> | undefined;
+  const getAttachedLlm = (): Promise<LLMInstance> => {
+    attached ??= (async () => {
+      await appInitializeFn(app);
+      return await agentInstance.attach_llm(llm);
+    })().catch((error) => {
+      attached = undefined;
+      throw error;
+    });
+    return attached;
+  };
+
   // Define the wrapper function
   const runAgent = async (...args: any[]): Promise<ToolResult> => {
     const kwargs = extractParamsFromArgs(args, inputSchema);
-    const inputData = parseInputWithSchema(inputSchema, kwargs);
+    const inputData = parseInput(kwargs);
     const queryInput = inputData && typeof inputData === 'object'
       ? (inputData as Record<string, any>).query ?? inputData
       : inputData;
@@ -45,11 +70,8 @@ export function createMcpAgentAdapter(
     
     const isolatedAgentTask = async (): Promise<void> => {
       try {
-        // Initialize the app
-        await appInitializeFn(app);
-        
-        // Attach LLM to the agent
-        const llmInstance: LLMInstance = await agentInstance.attach_llm(llm);
+        // Initialize the app and attach the LLM on first use
+        const llmInstance = await getAttachedLlm();
 
         // Execute the main operation
         const response = await llmInstance.generate_str(
@@ -73,14 +95,7 @@ export function createMcpAgentAdapter(
         resultPromise,
         taskPromise.then(() => resultPromise) // Ensure we wait for the task to complete
       ]);
-      const output = ensureSerializable(result);
-      if (output && typeof output === 'object') {
-        return {
-          content: [{ type: 'text', text: JSON.stringify(output, null, 2) }],
-          structuredContent: output
-        };
-      }
-      return { content: [{ type: 'text', text: String(result) }] };
+      return formatToolResult(ensureSerializable(result));
     } catch (error) {
       // Log any exceptions but don't re-raise unless it's a cancellation
       if (error instanceof Error) {
@@ -108,9 +123,11 @@ export function createSchemaFunction<T extends BaseModel>(
   schema: SchemaLike,
   implementation: (input: T) => Promise<any>
 ): (data: any) => Promise<any> {
+  const parseInput = compileInputSchema(schema);
+
   return async (data: any) => {
     const params = typeof data === 'object' && data !== null ? data : { value: data };
-    const input = parseInputWithSchema(schema, params) as T;
+    const input = parseInput(params) as T;
     return await implementation(input);
   };
 }
\ No newline at end of file
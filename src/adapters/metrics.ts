@@ -0,0 +1,130 @@
+const DEFAULT_SAMPLE_SIZE = 256;
+
+export interface ToolMetricsSnapshot {
+  calls: number;
+  /** Calls that threw or returned an `isError` tool result. */
+  errors: number;
+  meanMs: number;
+  maxMs: number;
+  /** Median latency over the most recent calls. */
+  p50Ms: number;
+  /** 95th percentile latency over the most recent calls. */
+  p95Ms: number;
+}
+
+interface ToolStats {
+  calls: number;
+  errors: number;
+  totalMs: number;
+  maxMs: number;
+  /** Ring buffer of recent durations, used for the percentiles. */
+  samples: number[];
+  next: number;
+}
+
+function percentile(sorted: number[], fraction: number): number {
+  if (sorted.length === 0) {
+    return 0;
+  }
+  const index = Math.min(sorted.length - 1, Math.ceil(fraction * sorted.length) - 1);
+  return sorted[Math.max(0, index)] ?? 0;
+}
+
+const round = (ms: number): number => Math.round(ms * 100) / 100;
+
+/**
+ * Per-tool call counts, error counts and latencies.
+ *
+ * Recording a call is a few field updates; percentiles are only computed when a
+ * snapshot is taken, over a fixed window of the most recent calls.
+ */
+export class ToolMetrics {
+  private stats = new Map<string, ToolStats>();
+  private sampleSize: number;
+
+  constructor(sampleSize: number = DEFAULT_SAMPLE_SIZE) {
+    this.sampleSize = sampleSize;
+  }
+
+  record(name: string, durationMs: number, failed: boolean): void {
+    let stats = this.stats.get(name);
+    if (!stats) {
+      stats = { calls: 0, errors: 0, totalMs: 0, maxMs: 0, samples: [], next: 0 };
+      this.stats.set(name, stats);
+    }
+    stats.calls += 1;
+    if (failed) {
+      stats.errors += 1;
+    }
+    stats.totalMs += durationMs;
+    stats.maxMs = Math.max(stats.maxMs, durationMs);
+    if (stats.samples.length < this.sampleSize) {
+      stats.samples.push(durationMs);
+    } else {
+      stats.samples[stats.next] = durationMs;
+      stats.next = (stats.next + 1) % this.sampleSize;
+    }
+  }
+
+  snapshot(): Record<string, ToolMetricsSnapshot> {
+    const result: Record<string, ToolMetricsSnapshot> = {};
+    for (const [name, stats] of this.stats) {
+      const sorted = [...stats.samples].sort((a, b) => a - b);
+      result[name] = {
+        calls: stats.calls,
+        errors: stats.errors,
+        meanMs: round(stats.totalMs / stats.calls),
+        maxMs: round(stats.maxMs),
+        p50Ms: round(percentile(sorted, 0.5)),
+        p95Ms: round(percentile(sorted, 0.95)),
+      };
+    }
+    return result;
+  }
+
+  reset(): void {
+    this.stats.clear();
+  }
+}
+
+/** Process-wide registry used by `withToolMetrics` unless another one is given. */
+export const toolMetrics = new ToolMetrics();
+
+export interface ToolMetricsOptions {
+  /** Name the calls are recorded under. Defaults to the wrapped function's name. */
+  name?: string;
+  /** Registry to record into. Defaults to the shared `toolMetrics`. */
+  metrics?: ToolMetrics;
+}
+
+/**
+ * Wrap a tool function so each call's latency and outcome are recorded.
+ *
+ * A thrown error or an `isError` tool result counts as a failure. Wrap outside
+ * `withResultCache` to measure what clients see, or inside it to measure only the
+ * calls that reach the agent.
+ */
+export function withToolMetrics<A extends any[], R>(
+  fn: (...args: A) => R | Promise<R>,
+  options: ToolMetricsOptions = {}
+): (...args: A) => Promise<R> {
+  const name = options.name ?? (fn.name || 'anonymous');
+  const metrics = options.metrics ?? toolMetrics;
+
+  const measured = async (...args: A): Promise<R> => {
+    const start = performance.now();
+    let failed = true;
+    try {
+      const value = await fn(...args);
+      failed = Boolean((value as { isError?: boolean } | null)?.isError);
+      return value;
+    } finally {
+      metrics.record(name, performance.now() - start, failed);
+    }
+  };
+
+  Object.defineProperty(measured, 'name', { value: fn.name });
+  Object.defineProperty(measured, 'description', { value: (fn as { description?: string }).description });
+
+  return measured;
+}
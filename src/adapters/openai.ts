@@ -1,5 +1,13 @@
 import { ToolResult } from './base.js';
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  muteConsole,
+  unmuteConsole,
+  type SchemaLike
+} from './utils.js';
 
 interface BaseModel {
   [key: string]: any;
@@ -13,31 +21,52 @@ interface Runner {
   run(agentInstance: any, params: Record<string, any>): Promise<RunnerResult>;
 }
 
+type AgentCall = (params: Record<string, any>) => Promise<any>;
+
+// Common method names
+const AGENT_METHODS = ['run', 'invoke', 'call', 'execute'];
+
+function resolveAgentCall(agentInstance: any): AgentCall | undefined {
+  // If agent is a function, call it directly
+  if (typeof agentInstance === 'function') {
+    return agentInstance;
+  }
+
+  for (const m of AGENT_METHODS) {
+    if (typeof agentInstance?.[m] === 'function') {
+      return agentInstance[m].bind(agentInstance);
+    }
+  }
+
+  // If agent exposes OpenAI client, expect a { model, messages } payload
+  if (agentInstance?.chat?.completions?.create) {
+    const completions = agentInstance.chat.completions;
+    return (params) => completions.create(params);
+  }
+
+  return undefined;
+}
+
+// Resolved entry points, so the method probing above runs once per agent rather than per call
+const resolvedCalls = new WeakMap<object, AgentCall>();
+
 // Default Runner: tries common method names or treats agent as a function
 const DefaultRunner: Runner = {
   async run(agentInstance: any, params: Record<string, any>): Promise<RunnerResult> {
-    // If agent is a function, call it directly
-    if (typeof agentInstance === 'function') {
-      const out = await agentInstance(params);
-      return { final_output: out };
-    }
-
-    // Common method names
-    const methods = ['run', 'invoke', 'call', 'execute'];
-    for (const m of methods) {
-      if (typeof agentInstance?.[m] === 'function') {
-        const out = await agentInstance[m](params);
-        return { final_output: out };
+    const cacheable = agentInstance !== null && (typeof agentInstance === 'object' || typeof agentInstance === 'function');
+    let call = cacheable ? resolvedCalls.get(agentInstance) : undefined;
+    if (!call) {
+      call = resolveAgentCall(agentInstance);
+      if (!call) {
+        throw new Error('Unsupported OpenAI agent type: provide a custom runner or a callable agent');
+      }
+      if (cacheable) {
+        resolvedCalls.set(agentInstance, call);
       }
     }
 
-    // If agent exposes OpenAI client, expect a { model, messages } payload
-    if (agentInstance?.chat?.completions?.create) {
-      const out = await agentInstance.chat.completions.create(params);
-      return { final_output: out };
-    }
-
-    throw new Error('Unsupported OpenAI agent type: provide a custom runner or a callable agent');
+    const out = await call(params);
+    return { final_output: out };
   }
 };
 
@@ -51,41 +80,22 @@ export function createOpenAIAdapter(
   inputSchema?: SchemaLike,
   runner: Runner = DefaultRunner
 ): (...args: any[]) => Promise<ToolResult> {
+  const parseInput = compileInputSchema(inputSchema);
+
   const runAgent = async (...args: any[]): Promise<ToolResult> => {
     const params = extractParamsFromArgs(args, inputSchema);
-    const parsedParams = parseInputWithSchema(inputSchema, params);
+    const parsedParams = parseInput(params);
     const effectiveParams = parsedParams && typeof parsedParams === 'object'
       ? parsedParams
       : params;
 
-    // Capture console output to avoid interfering with transports
-    const originalLog = console.log;
-    const originalWarn = console.warn;
-    const originalError = console.error;
-
-    console.log = () => {};
-    console.warn = () => {};
-    console.error = () => {};
+    muteConsole();
 
     try {
       const result = await runner.run(agentInstance, effectiveParams);
-      const output = ensureSerializable(result.final_output);
-      if (output && typeof output === 'object') {
-        return {
-          content: [{
-            type: 'text',
-            text: JSON.stringify(output, null, 2)
-          }],
-          structuredContent: output
-        };
-      }
-      return {
-        content: [{ type: 'text', text: String(output) }]
-      };
+      return formatToolResult(ensureSerializable(result.final_output));
     } finally {
-      console.log = originalLog;
-      console.warn = originalWarn;
-      console.error = originalError;
+      unmuteConsole();
     }
   };
 
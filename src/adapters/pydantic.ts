@@ -1,5 +1,14 @@
 import { ToolResult } from './base.js';
-import { ensureSerializable, extractParamsFromArgs, parseInputWithSchema, type SchemaLike } from './utils.js';
+import {
+  compileInputSchema,
+  ensureSerializable,
+  extractParamsFromArgs,
+  formatToolResult,
+  isQueryOnlySchema,
+  muteConsole,
+  unmuteConsole,
+  type SchemaLike
+} from './utils.js';
 
 interface BaseModel {
   [key: string]: any;
@@ -21,8 +30,26 @@ interface PydanticAgent {
   run(query: string): Promise<AgentResult | any>;
 }
 
+/**
+ * Pull a string query straight from the call arguments, if one is present.
+ */
+function directQuery(args: any[]): string | undefined {
+  const [first] = args;
+  if (typeof first === 'string') {
+    return first;
+  }
+  if (first && typeof first === 'object' && typeof first.query === 'string') {
+    return first.query;
+  }
+  return undefined;
+}
+
 /**
  * Convert a Pydantic agent instance to an MCP tool, making it async.
+ *
+ * Schemas that only declare `query: string` take a fast path that hands the
+ * query to the agent without running the schema parser. Multi-field schemas
+ * are validated on every call.
  */
 export function createPydanticAdapter(
   agentInstance: PydanticAgent,
@@ -30,29 +57,31 @@ export function createPydanticAdapter(
   description: string,
   inputSchema: SchemaLike
 ): (...args: any[]) => Promise<ToolResult> {
-  const runAgent = async (...args: any[]): Promise<ToolResult> => {
+  const queryOnly = isQueryOnlySchema(inputSchema);
+  const parseInput = compileInputSchema(inputSchema);
+
+  const resolveQuery = (args: any[]): string => {
+    const fastQuery = queryOnly ? directQuery(args) : undefined;
+    if (fastQuery !== undefined) {
+      return fastQuery;
+    }
+
     const kwargs = extractParamsFromArgs(args, inputSchema);
-    const parsedInput = parseInputWithSchema(inputSchema, kwargs);
+    const parsedInput = parseInput(kwargs);
+    const queryInput = parsedInput && typeof parsedInput === 'object'
+      ? (parsedInput as Record<string, any>).query ?? parsedInput
+      : parsedInput;
+    return typeof queryInput === 'string' ? queryInput : JSON.stringify(queryInput);
+  };
 
-    // Redirect stdout equivalent (capture console output)
-    const originalLog = console.log;
-    const originalWarn = console.warn;
-    const originalError = console.error;
-    const outputBuffer: string[] = [];
-    
-    // Override console methods to capture output
-    console.log = (...args) => outputBuffer.push(args.join(' '));
-    console.warn = (...args) => outputBuffer.push(args.join(' '));
-    console.error = (...args) => outputBuffer.push(args.join(' '));
+  const runAgent = async (...args: any[]): Promise<ToolResult> => {
+    const query = resolveQuery(args);
+
+    muteConsole();
 
     try {
       // Call the async run method
-      const queryInput = parsedInput && typeof parsedInput === 'object'
-        ? (parsedInput as Record<string, any>).query ?? parsedInput
-        : parsedInput;
-      const result = await agentInstance.run(
-        typeof queryInput === 'string' ? queryInput : JSON.stringify(queryInput)
-      );
+      const result = await agentInstance.run(query);
 
       let output: any = result;
 
@@ -64,23 +93,9 @@ export function createPydanticAdapter(
         }
       }
 
-      const serialized = ensureSerializable(output);
-
-      if (serialized && typeof serialized === 'object') {
-        return {
-          content: [{ type: 'text', text: JSON.stringify(serialized, null, 2) }],
-          structuredContent: serialized
-        };
-      }
-
-      return {
-        content: [{ type: 'text', text: String(serialized) }]
-      };
+      return formatToolResult(ensureSerializable(output));
     } finally {
-      // Restore original console methods
-      console.log = originalLog;
-      console.warn = originalWarn;
-      console.error = originalError;
+      unmuteConsole();
     }
   };
   
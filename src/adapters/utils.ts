@@ -1,4 +1,5 @@
 import { z, type AnyZodObject, type ZodTypeAny } from 'zod';
+import type { ToolResult } from './base.js';
 
 type SerializableValue = Record<string, any> | any[] | string | number | boolean | null;
 
@@ -61,6 +62,40 @@ function isPlainObject(obj: any): obj is Record<string, any> {
   return obj && typeof obj === 'object' && obj.constructor === Object;
 }
 
+// Single shared sink for agent console output; nothing is buffered or kept.
+const discard = (..._args: any[]): void => {};
+
+type ConsoleMethods = Pick<Console, 'log' | 'warn' | 'error'>;
+
+let activeRuns = 0;
+let savedConsole: ConsoleMethods | undefined;
+
+/**
+ * Point console output at the shared sink while at least one agent run is active.
+ * Overlapping runs share one redirection instead of each swapping console methods,
+ * so async runs that finish out of order cannot restore each other's overrides.
+ */
+export function muteConsole(): void {
+  if (activeRuns++ === 0) {
+    savedConsole = { log: console.log, warn: console.warn, error: console.error };
+    console.log = discard;
+    console.warn = discard;
+    console.error = discard;
+  }
+}
+
+/**
+ * Release one `muteConsole` call; the original methods return after the last release.
+ */
+export function unmuteConsole(): void {
+  if (--activeRuns === 0 && savedConsole) {
+    console.log = savedConsole.log;
+    console.warn = savedConsole.warn;
+    console.error = savedConsole.error;
+    savedConsole = undefined;
+  }
+}
+
 /**
  * Ensure an object is JSON serializable by converting if necessary.
  */
@@ -79,9 +114,14 @@ export function ensureSerializable(obj: any): SerializableValue {
   }
   
   if (isPlainObject(obj)) {
-    return Object.fromEntries(
-      Object.entries(obj).map(([k, v]) => [k, ensureSerializable(v)])
-    );
+    // Build the copy in one pass rather than via entries/map/fromEntries arrays.
+    const out: Record<string, SerializableValue> = {};
+    for (const key in obj) {
+      if (Object.prototype.hasOwnProperty.call(obj, key)) {
+        out[key] = ensureSerializable(obj[key]);
+      }
+    }
+    return out;
   }
   
   // Try various conversion methods
@@ -99,12 +139,14 @@ export function ensureSerializable(obj: any): SerializableValue {
     // Try to convert to dict if it has properties (similar to __dict__)
     if (typeof obj === 'object' && obj !== null) {
       // Filter out private attributes (starting with _) and functions
-      const filtered = Object.fromEntries(
-        Object.entries(obj).filter(([k, v]) => 
-          !k.startsWith('_') && typeof v !== 'function'
-        )
-      );
-      return ensureSerializable(filtered);
+      const filtered: Record<string, SerializableValue> = {};
+      for (const key of Object.keys(obj)) {
+        const value = obj[key];
+        if (!key.startsWith('_') && typeof value !== 'function') {
+          filtered[key] = ensureSerializable(value);
+        }
+      }
+      return filtered;
     }
     
     // For objects with a results attribute (common in search tools)
@@ -126,13 +168,40 @@ export function ensureSerializable(obj: any): SerializableValue {
   return String(obj);
 }
 
+/**
+ * Wrap a serialized agent output as a tool result.
+ *
+ * Objects are sent as compact JSON text and also exposed as `structuredContent`;
+ * clients parse the text rather than read it, so indentation only adds bytes.
+ */
+export function formatToolResult(output: SerializableValue): ToolResult {
+  if (output && typeof output === 'object') {
+    return {
+      content: [{ type: 'text', text: JSON.stringify(output) }],
+      structuredContent: output
+    };
+  }
+  return { content: [{ type: 'text', text: String(output) }] };
+}
+
+/**
+ * Whether a value is the request context `McpServer` passes after the tool arguments.
+ */
+export function isRequestExtra(value: any): boolean {
+  return Boolean(value) && typeof value === 'object'
+    && (value.signal instanceof AbortSignal || typeof value.sendNotification === 'function');
+}
+
 export function extractParamsFromArgs(args: any[], schema?: SchemaLike): Record<string, any> {
-  if (args.length === 1 && isPlainObject(args[0]) && !Array.isArray(args[0])) {
-    return { ...(args[0] as Record<string, any>) };
+  // `McpServer` calls tools as (params, extra) with params already validated against
+  // the registered shape; the request context is not a tool argument.
+  const callArgs = args.length === 2 && isRequestExtra(args[1]) ? args.slice(0, 1) : args;
+  if (callArgs.length === 1 && isPlainObject(callArgs[0]) && !Array.isArray(callArgs[0])) {
+    return { ...(callArgs[0] as Record<string, any>) };
   }
 
   if (!schema) {
-    return Object.fromEntries(args.map((value, index) => [`arg${index}`, value]));
+    return Object.fromEntries(callArgs.map((value, index) => [`arg${index}`, value]));
   }
 
   let fieldNames: string[] = [];
@@ -146,37 +215,87 @@ export function extractParamsFromArgs(args: any[], schema?: SchemaLike): Record<
 
   const params: Record<string, any> = {};
   fieldNames.forEach((fieldName, index) => {
-    if (index < args.length) {
-      params[fieldName] = args[index];
+    if (index < callArgs.length) {
+      params[fieldName] = callArgs[index];
     }
   });
 
   return params;
 }
 
-export function parseInputWithSchema(schema: SchemaLike | undefined, params: Record<string, any>): any {
+/**
+ * Whether a schema declares exactly one field, `query`, typed as a plain string.
+ */
+export function isQueryOnlySchema(schema: SchemaLike | undefined): boolean {
   if (!schema) {
-    return params;
+    return false;
   }
 
-  if (isZodObject(schema)) {
-    return schema.parse(params);
+  if (isZodObject(schema) || hasSchemaRecordValues(schema)) {
+    const shape: Record<string, ZodTypeAny> = isZodObject(schema) ? schema.shape : schema;
+    const keys = Object.keys(shape);
+    const query = shape.query;
+    // A string with refinements (min length, regex, ...) still needs the parser.
+    return keys.length === 1
+      && keys[0] === 'query'
+      && query instanceof z.ZodString
+      && query._def.checks.length === 0;
   }
 
-  if (hasSchemaRecordValues(schema)) {
-    return z.object(schema).parse(params);
+  if (hasModelFields(schema)) {
+    const fields = schema.model_fields ?? {};
+    const keys = Object.keys(fields);
+    return keys.length === 1
+      && keys[0] === 'query'
+      && (fields.query as { annotation?: unknown } | undefined)?.annotation === String;
   }
 
-  if (isModelClass(schema)) {
-    const instance = new schema(params);
-    if (typeof instance?.model_dump === 'function') {
-      return instance.model_dump();
-    }
-    if (typeof instance?.toJSON === 'function') {
-      return instance.toJSON();
+  return false;
+}
+
+export type InputParser = (params: Record<string, any>) => any;
+
+function isEmptyParams(params: Record<string, any>): boolean {
+  return params !== null
+    && typeof params === 'object'
+    && !Array.isArray(params)
+    && Object.keys(params).length === 0;
+}
+
+/**
+ * Resolve a schema to its parser once, so per-call validation skips schema dispatch
+ * and never rebuilds a `z.object` from a plain record of fields.
+ */
+export function compileInputSchema(schema: SchemaLike | undefined): InputParser {
+  if (!schema) {
+    return (params) => params;
+  }
+
+  if (isZodObject(schema) || hasSchemaRecordValues(schema)) {
+    const compiled = isZodObject(schema) ? schema : z.object(schema);
+    if (Object.keys(compiled.shape).length === 0) {
+      // No-argument tools: an empty call can only parse to `{}`, so skip zod for it
+      return (params) => (isEmptyParams(params) ? {} : compiled.parse(params));
     }
-    return instance;
+    return (params) => compiled.parse(params);
   }
 
-  return params;
-}
\ No newline at end of file
+  if (isModelClass(schema)) {
+    return (params) => {
+      const instance = new schema(params);
+      if (typeof instance?.model_dump === 'function') {
+        return instance.model_dump();
+      }
+      if (typeof instance?.toJSON === 'function') {
+        return instance.toJSON();
+      }
+      return instance;
+    };
+  }
+
+  return (params) => params;
+}
+
+export function parseInputWithSchema(schema: SchemaLike | undefined, params: Record<string, any>): any {
+  return compileInputSchema(schema)(params);
+}
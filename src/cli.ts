@@ -5,7 +5,6 @@ import { readFile, writeFile, access } from 'fs/promises';
 import { existsSync } from 'fs';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
-import yaml from 'yaml';
 import { spawn, type SpawnOptions } from 'child_process';
 import { Effect, Data } from 'effect';
 
@@ -171,9 +170,13 @@ const readConfigContent = (): Effect.Effect<string, ConfigFileError> =>
     catch: (cause) => new ConfigFileError({ path: CONFIG_FILE, reason: 'read', cause }),
   });
 
+// The YAML parser is only needed by `init`, so it is loaded on first use.
 const parseYamlConfig = (content: string): Effect.Effect<Config, ConfigFileError> =>
-  Effect.try({
-    try: () => yaml.parse(content) as Config,
+  Effect.tryPromise({
+    try: async () => {
+      const { default: yaml } = await import('yaml');
+      return yaml.parse(content) as Config;
+    },
     catch: (cause) => new ConfigFileError({ path: CONFIG_FILE, reason: 'parse', cause }),
   });
 
@@ -291,11 +294,20 @@ const spawnDetachedEffect = (
     return Effect.sync(cleanup);
   });
 
+// Parsed once per process; `init` both validates the framework and renders from it.
+let cachedConfig: Config | undefined;
+
 const loadFrameworkConfig = (): Effect.Effect<Config, ConfigFileError> =>
-  Effect.gen(function* (_) {
-    const content = yield* _(readConfigContent());
-    return yield* _(parseYamlConfig(content));
-  });
+  Effect.suspend(() =>
+    cachedConfig
+      ? Effect.succeed(cachedConfig)
+      : Effect.gen(function* (_) {
+          const content = yield* _(readConfigContent());
+          const config = yield* _(parseYamlConfig(content));
+          cachedConfig = config;
+          return config;
+        }),
+  );
 
 const loadAvailableFrameworksEffect = (): Effect.Effect<ReadonlyArray<string>, ConfigFileError> =>
   Effect.gen(function* (_) {
@@ -566,10 +578,6 @@ const runCliEffect = (effect: Effect.Effect<void, CliError>): Promise<void> =>
     ),
   );
 
-const availableFrameworks = await Effect.runPromise(
-  Effect.catchAll(loadAvailableFrameworksEffect(), () => Effect.succeed([] as string[])),
-);
-
 const program = new Command();
 
 program
@@ -577,10 +585,9 @@ program
   .description('AutoMCP-TS - Convert agents to MCP servers in TypeScript')
   .version('0.1.0');
 
+// Frameworks are validated inside `init` so other commands never read the config file.
 const frameworkChoicesDescription =
-  availableFrameworks.length > 0
-    ? `Agent framework to use (choices: ${availableFrameworks.join(', ')})`
-    : 'Agent framework to use (see templates/framework_config.yaml for options)';
+  'Agent framework to use (see templates/framework_config.yaml for options)';
 
 program
   .command('init')
@@ -1,5 +1,8 @@
-// Main CLI functionality
-export * from './cli.js';
+// The CLI lives at the `automcp-ts/cli` entrypoint; importing it runs the command
+// parser, so it is deliberately not re-exported here.
 
 // All adapter functions and utilities
 export * from './adapters/index.js';
+
+// Server entrypoint helpers
+export * from './server.js';
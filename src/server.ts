@@ -0,0 +1,251 @@
+import { randomUUID } from 'node:crypto';
+import { parseArgs } from 'node:util';
+import type { Request, Response } from 'express';
+import { StdioServerTransport } from '@modelcontextprotocol/sdk/server/stdio.js';
+import type { StreamableHTTPServerTransport } from '@modelcontextprotocol/sdk/server/streamableHttp.js';
+import type { Transport } from '@modelcontextprotocol/sdk/shared/transport.js';
+import { DEFAULT_NEGOTIATED_PROTOCOL_VERSION } from '@modelcontextprotocol/sdk/types.js';
+
+/**
+ * Anything that can be attached to an MCP transport: `McpServer` or the low-level `Server`.
+ */
+export interface ConnectableServer {
+  connect(transport: Transport): Promise<void>;
+}
+
+export interface HttpServeOptions {
+  /** Port to listen on. Defaults to `PORT` from the environment, or 8000. */
+  port?: number;
+  /** Request path for the Streamable HTTP endpoint. */
+  path?: string;
+}
+
+// Shared no-op used for every silenced console method.
+const discard = (..._args: any[]): void => {};
+
+let stdioSilenced: Pick<Console, 'log' | 'info' | 'debug'> | undefined;
+
+// Shared no-op returned when there is nothing to restore.
+const noRestore = (): void => {};
+
+/**
+ * Silence stdout console output for the lifetime of a stdio MCP server.
+ *
+ * The stdio transport owns stdout, so a stray `console.log` from an agent or one of
+ * its libraries would corrupt the JSON-RPC stream. `console.warn` and `console.error`
+ * write to stderr, which clients keep as the server log, so they are left alone and
+ * errors stay visible. This is installed once at startup, leaving no per-call or
+ * per-line work afterwards. The returned function puts the original methods back,
+ * for embedders that hand stdout back once the server has stopped.
+ */
+export function silenceConsoleForStdio(): () => void {
+  if (stdioSilenced) {
+    return noRestore;
+  }
+  const saved = { log: console.log, info: console.info, debug: console.debug };
+  stdioSilenced = saved;
+  console.log = discard;
+  console.info = discard;
+  console.debug = discard;
+
+  return () => {
+    if (stdioSilenced !== saved) {
+      return;
+    }
+    console.log = saved.log;
+    console.info = saved.info;
+    console.debug = saved.debug;
+    stdioSilenced = undefined;
+  };
+}
+
+/**
+ * Serve over stdio, with console output silenced so it cannot corrupt the stream.
+ */
+export async function serveStdio(server: ConnectableServer): Promise<void> {
+  silenceConsoleForStdio();
+  const transport = new StdioServerTransport();
+  await server.connect(transport);
+}
+
+/**
+ * Serve over Streamable HTTP, keeping one transport per MCP session.
+ */
+export async function serveHttp(server: ConnectableServer, options: HttpServeOptions = {}): Promise<void> {
+  const path = options.path ?? '/mcp';
+  const port = options.port ?? Number(process.env.PORT || 8000);
+  // Loaded here so stdio servers never pay for express or the HTTP transport
+  const [{ default: express }, { StreamableHTTPServerTransport: HttpTransport }] = await Promise.all([
+    import('express'),
+    import('@modelcontextprotocol/sdk/server/streamableHttp.js'),
+  ]);
+  const app = express();
+  app.use(express.json());
+
+  // Map to store transports by session ID
+  const transports: { [sessionId: string]: StreamableHTTPServerTransport } = {};
+
+  const negotiateVersion = (req: Request, res: Response): void => {
+    const protocolVersion = (req.headers['mcp-protocol-version'] as string | undefined) ?? DEFAULT_NEGOTIATED_PROTOCOL_VERSION;
+    res.setHeader('MCP-Protocol-Version', protocolVersion);
+  };
+
+  // Handle POST requests for client-to-server communication
+  app.post(path, async (req, res) => {
+    negotiateVersion(req, res);
+    const sessionId = req.headers['mcp-session-id'] as string | undefined;
+    const existing = sessionId ? transports[sessionId] : undefined;
+    let transport: StreamableHTTPServerTransport;
+
+    if (existing) {
+      transport = existing;
+    } else {
+      transport = new HttpTransport({
+        sessionIdGenerator: () => randomUUID(),
+        onsessioninitialized: (sessionId) => {
+          transports[sessionId] = transport;
+        }
+      });
+
+      transport.onclose = () => {
+        if (transport.sessionId) {
+          delete transports[transport.sessionId];
+        }
+      };
+
+      await server.connect(transport);
+    }
+
+    await transport.handleRequest(req, res, req.body);
+  });
+
+  // GET streams server-to-client notifications; DELETE terminates the session
+  const handleSessionRequest = async (req: Request, res: Response): Promise<void> => {
+    negotiateVersion(req, res);
+    const sessionId = req.headers['mcp-session-id'] as string | undefined;
+    const transport = sessionId ? transports[sessionId] : undefined;
+    if (!transport) {
+      res.status(400).send('Invalid or missing session ID');
+      return;
+    }
+    await transport.handleRequest(req, res);
+  };
+  app.get(path, handleSessionRequest);
+  app.delete(path, handleSessionRequest);
+
+  await new Promise<void>((resolve) => {
+    app.listen(port, () => {
+      console.log(`MCP Server running on http://localhost:${port}${path}`);
+      resolve();
+    });
+  });
+}
+
+export type ServerTransportKind = 'stdio' | 'http';
+
+export interface ServerCliOptions {
+  transport: ServerTransportKind;
+  port?: number;
+  cacheTtlSeconds?: number;
+}
+
+/**
+ * Parse server command-line arguments.
+ *
+ * Accepts the transport positionally (`stdio`, `sse`, `http`) or as `--transport`,
+ * plus `--port` and `--cache-ttl` (seconds). `sse` is kept as an alias for HTTP.
+ */
+export function parseServerArgs(argv: string[] = process.argv.slice(2)): ServerCliOptions {
+  const { values, positionals } = parseArgs({
+    args: argv,
+    allowPositionals: true,
+    strict: false,
+    options: {
+      transport: { type: 'string', short: 't' },
+      port: { type: 'string', short: 'p' },
+      'cache-ttl': { type: 'string' },
+    },
+  });
+
+  const rawTransport = String(values.transport ?? positionals[0] ?? 'stdio');
+  let transport: ServerTransportKind;
+  if (rawTransport === 'stdio') {
+    transport = 'stdio';
+  } else if (rawTransport === 'sse' || rawTransport === 'http') {
+    transport = 'http';
+  } else {
+    throw new Error(`Invalid transport: ${rawTransport} (expected stdio, sse or http)`);
+  }
+
+  const toNumber = (flag: string, value: unknown): number | undefined => {
+    if (value === undefined) {
+      return undefined;
+    }
+    const parsed = Number(value);
+    if (!Number.isFinite(parsed) || parsed < 0) {
+      throw new Error(`Invalid --${flag}: ${String(value)}`);
+    }
+    return parsed;
+  };
+
+  const options: ServerCliOptions = { transport };
+  const port = toNumber('port', values.port);
+  if (port !== undefined) {
+    options.port = port;
+  }
+  const cacheTtlSeconds = toNumber('cache-ttl', values['cache-ttl']);
+  if (cacheTtlSeconds !== undefined) {
+    options.cacheTtlSeconds = cacheTtlSeconds;
+  }
+  return options;
+}
+
+export interface RunServerOptions {
+  /** Command-line arguments to parse. Defaults to `process.argv.slice(2)`. */
+  argv?: string[];
+  /**
+   * Cleanup to finish before the process exits on SIGINT or SIGTERM, e.g. closing
+   * database connections. Register cleanup here rather than in separate signal
+   * handlers, which the exit would cut short.
+   */
+  onShutdown?: () => unknown | Promise<unknown>;
+}
+
+/**
+ * Standard entrypoint for a generated server: parses the command line, applies
+ * `--cache-ttl` to result caches created afterwards, and starts the chosen transport.
+ */
+export async function runServer(
+  server: ConnectableServer,
+  runOptions: RunServerOptions | string[] = {}
+): Promise<void> {
+  const { argv = process.argv.slice(2), onShutdown } = Array.isArray(runOptions) ? { argv: runOptions } : runOptions;
+  const options = parseServerArgs(argv);
+  if (options.cacheTtlSeconds !== undefined) {
+    process.env.AUTOMCP_CACHE_TTL = String(options.cacheTtlSeconds);
+  }
+
+  let shuttingDown = false;
+  const shutdown = async () => {
+    if (shuttingDown) {
+      return;
+    }
+    shuttingDown = true;
+    console.log('\nShutting down MCP server...');
+    try {
+      await onShutdown?.();
+    } catch (error) {
+      process.stderr.write(`Error during shutdown: ${error}\n`);
+      process.exit(1);
+    }
+    process.exit(0);
+  };
+  process.on('SIGINT', shutdown);
+  process.on('SIGTERM', shutdown);
+
+  if (options.transport === 'http') {
+    await serveHttp(server, options.port !== undefined ? { port: options.port } : {});
+  } else {
+    await serveStdio(server);
+  }
+}